@@ -1,12 +1,18 @@
 import streamlit as st
-import requests
-from PIL import Image
-from io import BytesIO
-import pandas as pd
-import plotly.express as px
-import datetime
-import json
-import random
+import contextlib
+import functools
+
+from catalog import CATEGORY_OPTIONS, DEFAULT_CATALOG_PATH
+from charts import FigureCache, IncrementalCategoryCounts, category_bar, chart_key, growth_bar, history_lines
+from engine import GROWTH_SORT, SEMANTIC_MIN_SCORE, ResultCache, normalize_query
+from export import EXPORT_FORMATS, export_file, export_name
+from governor import HOST_LIMITER, MAX_HEAVY_RENDERS, OUTBOUND, RENDER_WAIT, ConcurrencyGovernor
+from instrumentation import MetricsStore, RerunProfiler, is_fragment_rerun, session_id
+from logos import LogoCache
+from refresher import RefreshScheduler, SnapshotBuilder
+from semantic import VectorIndex, snapshot_documents
+from views import PAGE_SIZES, card_grid_html, compact_markdown, page_bounds
+from warmstart import WarmStart
 
 # Page configuration with improved layout and theme
 st.set_page_config(
@@ -16,8 +22,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- Instrumentation (per-section timings for this rerun) ---
+@st.cache_resource
+def get_metrics_store():
+    return MetricsStore()
+
+profiler = RerunProfiler(get_metrics_store())
+
 # Custom CSS for better styling
-st.markdown("""
+with profiler.section("css"):
+    st.markdown("""
 <style>
     .main-header {
         font-size: 42px;
@@ -43,6 +57,35 @@ st.markdown("""
         transform: translateY(-5px);
         box-shadow: 0 10px 20px rgba(0,0,0,0.1);
     }
+    .tool-grid {
+        display: grid;
+        grid-template-columns: repeat(3, minmax(0, 1fr));
+        gap: 15px;
+    }
+    @media (max-width: 900px) {
+        .tool-grid {
+            grid-template-columns: minmax(0, 1fr);
+        }
+    }
+    .tool-card-header {
+        display: flex;
+        align-items: center;
+        gap: 12px;
+        margin-bottom: 10px;
+    }
+    .tool-logo {
+        display: inline-block;
+        width: 40px;
+        height: 40px;
+        font-size: 28px;
+        flex-shrink: 0;
+        background-repeat: no-repeat;
+    }
+    .tool-metrics {
+        display: flex;
+        justify-content: space-between;
+        margin: 8px 0;
+    }
     .category-badge {
         background-color: #e1f5fe;
         color: #0277bd;
@@ -107,45 +150,91 @@ st.markdown("""
         border-color: #4CAF50;
     }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
+
+# --- Warm Start (prepared state reloaded from the previous process) ---
+@st.cache_resource
+def get_warm_start():
+    return WarmStart()
+
+# --- Data Snapshot (rebuilt by one background thread per process) ---
+@st.cache_resource
+def get_refresher(category_options):
+    warm_start = get_warm_start()
+    builder = SnapshotBuilder(DEFAULT_CATALOG_PATH, category_options, warm_start=warm_start)
+    refresher = RefreshScheduler(builder).start()
+    warm_start.provide("search_index", lambda: builder.warm_state(refresher.current()))
+    return refresher
+
+# --- Figure Cache (shared across sessions and reruns) ---
+@st.cache_resource
+def get_figure_cache():
+    cache = FigureCache()
+    warm_start = get_warm_start()
+    cache.restore(warm_start.take("figures", None) or {})
+    warm_start.provide("figures", lambda: (None, cache.specs()))
+    return cache
+
+# --- Query Result Cache (shared across sessions and reruns) ---
+@st.cache_resource
+def get_result_cache():
+    cache = ResultCache()
+    store = get_metrics_store()
+    store.add_gauge("aitrend_result_cache_hits", "Search results served from the shared result cache.",
+                    lambda: cache.hits)
+    store.add_gauge("aitrend_result_cache_misses", "Search results computed by the query engine.",
+                    lambda: cache.misses)
+    store.add_gauge("aitrend_result_cache_entries", "Entries held by the shared result cache.", lambda: len(cache))
+    return cache
+
+# --- Semantic Vector Index (persistent, one per snapshot version, shared across sessions and reruns) ---
+@st.cache_resource(max_entries=2)
+def get_vector_index(version):
+    # Keyed by version so a rerun still on the previous snapshot never searches
+    # an index another rerun re-synced to the new one. A new version's index
+    # loads the last saved one and only embeds what changed.
+    return VectorIndex()
+
+# --- Logo Cache (shared across sessions and reruns) ---
+@st.cache_resource
+def get_logo_cache():
+    return LogoCache()
+
+# --- Render Governor (bounds concurrent Cards/Table renders per process) ---
+@st.cache_resource
+def get_render_governor():
+    governor = ConcurrencyGovernor(MAX_HEAVY_RENDERS, wait=RENDER_WAIT)
+    store = get_metrics_store()
+    store.add_gauge("aitrend_heavy_renders_active", "Cards/Table renders in progress.", lambda: governor.active)
+    store.add_gauge("aitrend_heavy_render_queue_depth", "Reruns waiting for a render slot.", lambda: governor.waiting)
+    store.add_gauge("aitrend_heavy_renders_shed_total", "Cards/Table renders degraded to the Compact list.",
+                    lambda: governor.shed)
+    store.add_gauge("aitrend_outbound_queue_depth", "Outbound fetches waiting for a slot.", lambda: OUTBOUND.waiting)
+    store.add_gauge("aitrend_outbound_shed_total", "Outbound fetches shed for lack of a slot.", lambda: OUTBOUND.shed)
+    store.add_gauge("aitrend_outbound_throttled_total", "Outbound fetches refused by the per-host rate limit.",
+                    lambda: HOST_LIMITER.throttled)
+    return governor
 
 # --- Sidebar for filters and options ---
-with st.sidebar:
+with profiler.section("sidebar"), st.sidebar:
     st.markdown('<div class="sidebar-content">', unsafe_allow_html=True)
     st.image("https://raw.githubusercontent.com/streamlit/streamlit/develop/lib/streamlit/static/favicon.png", width=100)
     st.markdown("## Dashboard Settings")
     
-    # Search input
-    search_query = st.text_input("🔍 Search Tools or Models")
-    
-    # Category filter with improved UI
-    category_options = ["Design", "Prototyping", "Automation", "LLM", "Vision", "Multimodal", "Code Generation", "Productivity"]
-    category_filter = st.multiselect(
-        "📂 Filter by Category",
-        category_options,
-        default=[]
-    )
-    
-    # Rating filter
-    min_rating = st.slider("⭐ Minimum Rating", 1.0, 5.0, 3.5, 0.1)
-    
-    # Sort options
-    sort_by = st.selectbox(
-        "🔄 Sort by",
-        ["Popularity", "Rating", "Name", "Recently Added"]
-    )
-    
-    # View options
-    view_mode = st.radio(
-        "🔍 View Mode",
-        ["Cards", "Table", "Compact"]
-    )
+    # Filter widgets are drawn here by the tool explorer fragment below
+    filter_slot = st.container()
     
     # Note about theme functionality
     st.info("Note: Theme customization requires additional configuration with custom Streamlit themes. Using default theme for now.")
     
     # Refresh data button
     refresh = st.button("🔄 Refresh Data")
+    refresher = get_refresher(tuple(CATEGORY_OPTIONS))
+    if refresh:
+        refresher.trigger()
+        st.toast("Refreshing data in the background…")
+    # Read once so the whole rerun sees a consistent snapshot
+    snapshot = refresher.current()
     
     st.markdown("</div>", unsafe_allow_html=True)
     
@@ -161,391 +250,384 @@ with st.sidebar:
     st.markdown("- [AI Newsletter](https://newsletter.ai)")
     
     # Last updated timestamp
-    current_date = datetime.datetime.now().strftime("%B %d, %Y %H:%M")
-    st.markdown(f"Last updated: {current_date}")
+    current_date = snapshot.built_at.strftime("%B %d, %Y %H:%M")
+    st.markdown(f"Last updated: {current_date} (refresh took {snapshot.build_seconds:.2f}s)")
+    if refresher.refreshing:
+        st.caption("🔄 Refresh in progress…")
 
 # --- Main Content Area ---
-st.markdown('<h1 class="main-header">🤖 AI Trends & Code Generation Tools (2025)</h1>', unsafe_allow_html=True)
-
-# --- Tool Data with expanded information ---
-tools = [
-    {
-        "name": "Vercel v0",
-        "description": "AI-powered UI-to-code tool by Vercel, turns natural language into React + Tailwind components. Features pixel-perfect components, responsive design, and accessibility options.",
-        "link": "https://v0.dev",
-        "category": ["Prototyping", "Code Generation"],
-        "logo": "https://assets.vercel.com/image/upload/front/favicon/vercel/favicon.ico",
-        "rating": 4.8,
-        "users": 238500,
-        "pricing": "Freemium",
-        "added": "2024-09-15",
-        "updated": "2025-04-22"
-    },
-    {
-        "name": "Lovable",
-        "description": "Generative AI design tool for creating beautiful web designs and marketing sites from prompts. Supports direct export to code and integration with popular design tools.",
-        "link": "https://www.lovable.so",
-        "category": ["Design", "Prototyping"],
-        "logo": "https://www.lovable.so/favicon.ico",
-        "rating": 4.5,
-        "users": 120000,
-        "pricing": "Subscription",
-        "added": "2024-12-01",
-        "updated": "2025-04-18"
-    },
-    {
-        "name": "Bolt AI",
-        "description": "AI assistant for generating code, managing tasks, and automating workflows inside VS Code. Supports multiple programming languages and frameworks with contextual suggestions.",
-        "link": "https://bolt.ai",
-        "category": ["Automation", "Code Generation", "Productivity"],
-        "logo": "https://bolt.ai/favicon.ico",
-        "rating": 4.7,
-        "users": 185000,
-        "pricing": "Free/Pro",
-        "added": "2024-07-10",
-        "updated": "2025-05-01"
-    },
-    {
-        "name": "Uizard",
-        "description": "AI-powered wireframing and prototyping tool that turns sketches or text prompts into interactive UI designs. Features team collaboration, design system integration, and code export.",
-        "link": "https://uizard.io",
-        "category": ["Design", "Prototyping"],
-        "logo": "https://uizard.io/favicon.ico",
-        "rating": 4.3,
-        "users": 95000,
-        "pricing": "Freemium",
-        "added": "2023-11-20",
-        "updated": "2025-03-15"
-    },
-    {
-        "name": "Durable",
-        "description": "AI website builder that generates entire websites (copy, images, layout) for small businesses in seconds. Integrates with business tools and e-commerce platforms.",
-        "link": "https://durable.co",
-        "category": ["Design", "Automation"],
-        "logo": "https://durable.co/favicon.ico",
-        "rating": 4.2,
-        "users": 78000,
-        "pricing": "Subscription",
-        "added": "2024-02-28",
-        "updated": "2025-04-10"
-    },
-    {
-        "name": "Builder.io",
-        "description": "Visual editor for headless CMS and e-commerce sites, with AI assistance for components and layouts. Supports all major frameworks and headless CMS platforms.",
-        "link": "https://www.builder.io",
-        "category": ["Design", "Prototyping"],
-        "logo": "https://www.builder.io/favicon.ico",
-        "rating": 4.1,
-        "users": 65000,
-        "pricing": "Team/Enterprise",
-        "added": "2023-10-05",
-        "updated": "2025-02-20"
-    },
-    {
-        "name": "CodeWhisperer Pro",
-        "description": "Advanced AI code assistant with full-context understanding, supports 20+ languages and integrates with all major IDEs. Features code reviews, security scanning, and documentation generation.",
-        "link": "https://codewhisperer.dev",
-        "category": ["Code Generation", "Productivity"],
-        "logo": "https://codewhisperer.dev/favicon.ico",
-        "rating": 4.9,
-        "users": 320000,
-        "pricing": "Pro/Team",
-        "added": "2024-08-12",
-        "updated": "2025-04-30"
-    },
-    {
-        "name": "Midjourney v6",
-        "description": "Latest version of the AI image generation tool with enhanced code-to-image capabilities for UI mockups and design assets. Features direct export to design tools.",
-        "link": "https://www.midjourney.com",
-        "category": ["Design", "Vision"],
-        "logo": "https://www.midjourney.com/favicon.ico",
-        "rating": 4.7,
-        "users": 410000,
-        "pricing": "Subscription",
-        "added": "2024-11-10",
-        "updated": "2025-03-28"
-    },
-    {
-        "name": "GPT-5 Code",
-        "description": "Specialized GPT model fine-tuned for code generation, debugging, and optimization across all major programming languages. Integrated with GitHub and CI/CD pipelines.",
-        "link": "https://openai.com/gpt5-code",
-        "category": ["LLM", "Code Generation"],
-        "logo": "https://openai.com/favicon.ico",
-        "rating": 4.8,
-        "users": 580000,
-        "pricing": "API/Enterprise",
-        "added": "2025-01-15",
-        "updated": "2025-04-25"
-    },
-    {
-        "name": "Devflow",
-        "description": "No-code platform for creating automated workflows and internal tools using AI-generated components. Features database integration and custom logic builders.",
-        "link": "https://devflow.app",
-        "category": ["Automation", "Productivity"],
-        "logo": "https://devflow.app/favicon.ico",
-        "rating": 4.0,
-        "users": 42000,
-        "pricing": "Free/Team",
-        "added": "2024-06-18",
-        "updated": "2025-02-10"
-    },
-    {
-        "name": "Claude Studio",
-        "description": "Advanced multimodal AI assistant for creative coding projects, with visual programming capabilities and interactive prototyping features. Supports pair programming and debugging.",
-        "link": "https://claude.ai/studio",
-        "category": ["Multimodal", "Code Generation", "LLM"],
-        "logo": "https://claude.ai/favicon.ico",
-        "rating": 4.6,
-        "users": 210000,
-        "pricing": "Pro/Enterprise",
-        "added": "2025-02-01",
-        "updated": "2025-05-02"
-    },
-    {
-        "name": "Replit GhostWriter+",
-        "description": "AI pair programming tool with full IDE integration, real-time suggestions, and project-level understanding. Features automated testing and documentation capabilities.",
-        "link": "https://replit.com/ghostwriter",
-        "category": ["Code Generation", "Productivity"],
-        "logo": "https://replit.com/favicon.ico",
-        "rating": 4.4,
-        "users": 155000,
-        "pricing": "Subscription",
-        "added": "2024-10-20",
-        "updated": "2025-04-05"
-    }
-]
-
-# --- Filter Tools ---
-def filter_tools(tools, query, categories, min_rating):
-    filtered = []
-    for tool in tools:
-        if query.lower() in tool["name"].lower() or query.lower() in tool["description"].lower():
-            if (not categories or any(cat in tool["category"] for cat in categories)) and tool["rating"] >= min_rating:
-                filtered.append(tool)
-    return filtered
-
-# --- Sort Tools ---
-def sort_tools(tools, sort_by):
-    if sort_by == "Popularity":
-        return sorted(tools, key=lambda x: x["users"], reverse=True)
-    elif sort_by == "Rating":
-        return sorted(tools, key=lambda x: x["rating"], reverse=True)
-    elif sort_by == "Name":
-        return sorted(tools, key=lambda x: x["name"])
-    elif sort_by == "Recently Added":
-        return sorted(tools, key=lambda x: x["added"], reverse=True)
-    return tools
-
-filtered_tools = filter_tools(tools, search_query, category_filter, min_rating)
-sorted_tools = sort_tools(filtered_tools, sort_by)
-
-# --- Dashboard Overview ---
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric("Total Tools", len(tools))
-with col2:
-    st.metric("Filtered Tools", len(filtered_tools))
-with col3:
-    avg_rating = sum(tool["rating"] for tool in filtered_tools) / len(filtered_tools) if filtered_tools else 0
-    st.metric("Average Rating", f"{avg_rating:.1f} ⭐")
-with col4:
-    total_users = sum(tool["users"] for tool in filtered_tools)
-    st.metric("Combined Users", f"{total_users:,}")
+with profiler.section("header"):
+    st.markdown('<h1 class="main-header">🤖 AI Trends & Code Generation Tools (2025)</h1>', unsafe_allow_html=True)
+
+# Written by the tool explorer fragment, which owns everything that depends on the filters
+overview_slot = st.container()
 
 # --- Category Distribution Chart ---
-st.markdown('<h2 class="sub-header">📊 Category Distribution</h2>', unsafe_allow_html=True)
-category_counts = {}
-for tool in tools:
-    for category in tool["category"]:
-        category_counts[category] = category_counts.get(category, 0) + 1
-
-df_categories = pd.DataFrame({
-    'Category': list(category_counts.keys()),
-    'Count': list(category_counts.values())
-})
-
-fig = px.bar(
-    df_categories, 
-    x='Category', 
-    y='Count',
-    color='Count',
-    color_continuous_scale='blues',
-    text='Count',
-    title='Tools by Category'
-)
-fig.update_layout(height=400)
-st.plotly_chart(fig, use_container_width=True)
-
-# --- Tools Display Section ---
-st.markdown('<h2 class="sub-header">🛠️ AI Code & Site Generation Tools</h2>', unsafe_allow_html=True)
-
-# Toggle between different view modes
-if view_mode == "Table":
-    # Table view
-    df_tools = pd.DataFrame(sorted_tools)
-    if not df_tools.empty:
-        # Prepare data for display
-        display_df = df_tools[['name', 'rating', 'users', 'pricing', 'updated']].copy()
-        display_df.columns = ['Name', 'Rating', 'Users', 'Pricing', 'Last Updated']
-        display_df['Rating'] = display_df['Rating'].apply(lambda x: f"{x:.1f} ⭐")
-        display_df['Users'] = display_df['Users'].apply(lambda x: f"{x:,}")
-        
-        st.dataframe(display_df, use_container_width=True)
-        
-elif view_mode == "Compact":
-    # Compact list view
-    for tool in sorted_tools:
-        st.markdown(f"""
-        **[{tool['name']}]({tool['link']})** - {tool['rating']:.1f}⭐ - {tool['pricing']}  
-        {tool['description'][:100]}... - *{', '.join(tool['category'])}*
-        """)
-        st.markdown("---")
-        
-else:
-    # Card view (default)
-    for i in range(0, len(sorted_tools), 3):
-        cols = st.columns(3)
-        for j in range(3):
-            if i + j < len(sorted_tools):
-                tool = sorted_tools[i + j]
-                with cols[j]:
-                    st.markdown(f'<div class="tool-card">', unsafe_allow_html=True)
-                    
-                    # Logo and title row
-                    logo_col, title_col = st.columns([1, 4])
-                    with logo_col:
-                        try:
-                            response = requests.get(tool["logo"])
-                            logo = Image.open(BytesIO(response.content))
-                            st.image(logo, width=40)
-                        except:
-                            st.write("🔧")
-                    
-                    with title_col:
-                        st.markdown(f"<a href='{tool['link']}' class='tool-link' target='_blank'>{tool['name']}</a>", unsafe_allow_html=True)
-                        st.markdown(f"<span>{'⭐' * int(tool['rating'])}</span> <span>{tool['rating']:.1f}</span>", unsafe_allow_html=True)
-                    
-                    # Description
-                    st.markdown(f"<p class='tool-description'>{tool['description']}</p>", unsafe_allow_html=True)
-                    
-                    # Categories
-                    for cat in tool["category"]:
-                        st.markdown(f"<span class='category-badge'>{cat}</span>", unsafe_allow_html=True)
-                    
-                    # Metrics row
-                    metrics_col1, metrics_col2 = st.columns(2)
-                    with metrics_col1:
-                        st.markdown(f"👥 **{tool['users']:,}** users")
-                    with metrics_col2:
-                        st.markdown(f"💰 {tool['pricing']}")
-                        
-                    st.markdown(f"🗓️ Updated: {tool['updated']}")
-                    st.markdown('</div>', unsafe_allow_html=True)
+with profiler.section("chart"):
+    st.markdown('<h2 class="sub-header">📊 Category Distribution</h2>', unsafe_allow_html=True)
+    chart_filtered = st.checkbox("Only count tools matching the current filters")
+    chart_slot = st.container()
+    if not chart_filtered:
+        # Computed over the full catalog, so it only changes with the catalog version
+        key = chart_key(snapshot.catalog.version, "category_bar", counts="all")
+        fig = get_figure_cache().get(key, lambda: category_bar(snapshot.engine.category_counts(), 'Tools by Category'))
+        chart_slot.plotly_chart(fig, use_container_width=True)
+
+tools_slot = st.container()
+
+# --- Tool Explorer (reruns on its own when a filter changes) ---
+@st.fragment(key="tool_explorer")
+def tool_explorer(snapshot, chart_filtered, filter_slot, overview_slot, chart_slot, tools_slot):
+    """Filters, overview metrics and tool list; a filter change reruns only this fragment.
+
+    Arguments are the ones the last full rerun passed, so the explorer always
+    shows the same snapshot as the static sections around it.
+    """
+    fragment_rerun = is_fragment_rerun()
+    run_profiler = RerunProfiler(get_metrics_store(), scope="tool_explorer") if fragment_rerun else profiler
+
+    with run_profiler.section("filters"), filter_slot:
+        # Search input
+        search_query = st.text_input("🔍 Search Tools or Models", key="search_query")
+        semantic_search = st.toggle("🧠 Semantic search", key="semantic_search",
+                                    help="Match tools by meaning (offline TF-IDF/SVD index) instead of by substring")
+
+        # Category filter with improved UI
+        category_options = CATEGORY_OPTIONS
+        category_filter = st.multiselect(
+            "📂 Filter by Category",
+            category_options,
+            default=[],
+            key="category_filter"
+        )
+
+        # Rating filter
+        min_rating = st.slider("⭐ Minimum Rating", 1.0, 5.0, 3.5, 0.1, key="min_rating")
+
+        # Sort options
+        sort_by = st.selectbox(
+            "🔄 Sort by",
+            ["Popularity", "Rating", "Name", "Recently Added", GROWTH_SORT, "Relevance"],
+            key="sort_by"
+        )
+
+        # View options
+        view_mode = st.radio(
+            "🔍 View Mode",
+            ["Cards", "Table", "Compact"],
+            key="view_mode"
+        )
+
+        # Pagination options for Cards and Compact views
+        page_size = st.selectbox("📄 Tools per page", PAGE_SIZES, key="page_size")
+        pagination = st.radio("📜 Pagination", ["Pages", "Infinite scroll"], horizontal=True, key="pagination")
+
+    # --- Tool Data (from the current snapshot) ---
+    with run_profiler.section("query"):
+        catalog = snapshot.catalog
+        tools = catalog.tools
+        engine = snapshot.engine
+        vectors = None
+        if semantic_search and normalize_query(search_query):
+            vectors_version = (catalog.version, snapshot.built_at)
+            vectors = get_vector_index(vectors_version)
+            with st.spinner("Indexing descriptions…"):
+                # Only new or edited documents are embedded; unchanged snapshots skip even building them
+                vectors.sync(lambda: snapshot_documents(snapshot), version=vectors_version)
+        # Memoized by normalized query, so common searches skip filtering and sorting entirely.
+        # The full ordered ids are needed even for page 1 (metrics, page count, category
+        # chart, Table view), so the engine's top-k ``limit`` is not used here.
+        result_ids = get_result_cache().get(engine, catalog.version, search_query, category_filter, min_rating, sort_by,
+                                            vectors=vectors)
+        result_metrics = engine.metrics_for(result_ids)
+
+        # --- Pagination (page state persists across reruns in st.session_state) ---
+        page_key = (normalize_query(search_query), semantic_search, tuple(category_filter), min_rating, sort_by, view_mode, page_size, pagination)
+        if st.session_state.get("page_key") != page_key:
+            st.session_state.page_key = page_key
+            st.session_state.page = 0
+
+        def change_page(delta):
+            st.session_state.page += delta
+
+    # --- Dashboard Overview ---
+    with run_profiler.section("overview"), overview_slot:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Tools", len(tools))
+        with col2:
+            st.metric("Filtered Tools", result_metrics["count"])
+        with col3:
+            st.metric("Average Rating", f"{result_metrics['avg_rating']:.1f} ⭐")
+        with col4:
+            st.metric("Combined Users", f"{result_metrics['total_users']:,}")
+
+    # --- Filtered Category Chart ---
+    if chart_filtered:
+        with run_profiler.section("filtered_chart"), chart_slot:
+            # Incrementally updated from the previous rerun's selection
+            counter = st.session_state.get("category_counter")
+            if counter is None or counter.engine is not engine:
+                counter = st.session_state.category_counter = IncrementalCategoryCounts(engine)
+            category_counts = counter.update(result_ids)
+            key = chart_key(catalog.version, "category_bar", counts=tuple((c, int(n)) for c, n in category_counts.items()))
+            fig = get_figure_cache().get(key, lambda: category_bar(category_counts, 'Filtered Tools by Category'))
+            st.plotly_chart(fig, use_container_width=True)
+
+    # --- Tools Display Section ---
+    with run_profiler.section("tools"), tools_slot:
+        st.markdown('<h2 class="sub-header">🛠️ AI Code & Site Generation Tools</h2>', unsafe_allow_html=True)
+
+        # Export the current filter/sort result; the file is only written when the button is clicked
+        export_col, download_col = st.columns([1, 3])
+        with export_col:
+            export_format = st.selectbox("Export format", list(EXPORT_FORMATS), key="export_format",
+                                         label_visibility="collapsed")
+        with download_col:
+            st.download_button(
+                f"⬇️ Download {len(result_ids):,} tools",
+                data=lambda: export_file(catalog.table, result_ids, export_format),
+                file_name=export_name(export_format),
+                mime=EXPORT_FORMATS[export_format][1],
+                disabled=not len(result_ids),
+            )
+
+        # Cards and Table take a render slot; when the process is saturated (or this
+        # session already holds one) they degrade to the Compact list of the page.
+        heavy = view_mode != "Compact"
+        render_slot = get_render_governor().slot(session_id()) if heavy else contextlib.nullcontext(True)
+        with render_slot as admitted:
+            shown_mode = view_mode if admitted else "Compact"
+            if not admitted:
+                st.caption(f"⏳ The server is busy, so this page is shown as a compact list instead of {view_mode}.")
+
+            # Toggle between different view modes
+            if shown_mode == "Table":
+                # Table view, formatted column-wise by the frontend
+                if len(result_ids):
+                    st.dataframe(
+                        engine.rows(result_ids, ['name', 'rating', 'users', 'pricing', 'updated']),
+                        use_container_width=True,
+                        column_config={
+                            "name": "Name",
+                            "rating": st.column_config.NumberColumn("Rating", format="%.1f ⭐"),
+                            "users": st.column_config.NumberColumn("Users", format="localized"),
+                            "pricing": "Pricing",
+                            "updated": st.column_config.DateColumn("Last Updated", format="YYYY-MM-DD"),
+                        },
+                    )
+
+            else:
+                # Cards and Compact views only render the visible slice
+                page, start, stop, page_count = page_bounds(len(result_ids), st.session_state.page, page_size)
+                st.session_state.page = page
+                if pagination == "Infinite scroll":
+                    start = 0
+                visible_tools = tools.take(result_ids[start:stop])
+
+                if not visible_tools:
+                    st.info("No tools match the current filters.")
+                elif shown_mode == "Compact":
+                    # Compact list view
+                    st.markdown(compact_markdown(visible_tools))
+                else:
+                    # Card view (default), one HTML block per page
+                    # All of the page's logos come from one sprite sheet
+                    sprite = get_logo_cache().get_sprite(tool.logo for tool in visible_tools)
+                    st.markdown(card_grid_html(visible_tools, sprite), unsafe_allow_html=True)
+
+                if pagination == "Infinite scroll":
+                    if page + 1 < page_count:
+                        st.button("⬇️ Load more", on_click=change_page, args=(1,))
+                elif page_count > 1:
+                    prev_col, page_col, next_col = st.columns([1, 2, 1])
+                    with prev_col:
+                        st.button("◀ Previous", on_click=change_page, args=(-1,), disabled=page == 0)
+                    with page_col:
+                        st.markdown(f"Page {page + 1} of {page_count} · tools {start + 1}-{stop} of {len(result_ids)}")
+                    with next_col:
+                        st.button("Next ▶", on_click=change_page, args=(1,), disabled=page + 1 >= page_count)
+
+        if vectors is not None:
+            # Semantic mode also searches trending repositories and papers
+            (_, scores, refs, kinds), = vectors.search([search_query], k=5, kinds=("repo", "paper"))
+            related = [ref if kind == "paper" else f"[{ref}](https://github.com/{ref})"
+                       for ref, kind, score in zip(refs, kinds, scores) if score >= SEMANTIC_MIN_SCORE]
+            if related:
+                with st.expander("🔗 Related research & repositories"):
+                    st.markdown("\n".join(f"- {item}" for item in related))
+
+    if fragment_rerun:
+        run_profiler.finish()
+
+tool_explorer(snapshot, chart_filtered, filter_slot, overview_slot, chart_slot, tools_slot)
 
 # --- Live Trending Models Section ---
-st.markdown('<h2 class="sub-header">📈 Trending AI Models</h2>', unsafe_allow_html=True)
-
-# Generate sample data for trending models
-def generate_trending_models():
-    hf_models = [
-        {"modelId": "meta-llama/Llama-3-70B-Instruct", "url": "https://huggingface.co/meta-llama/Llama-3-70B-Instruct", "downloads": 1250000, "stars": 4520},
-        {"modelId": "anthropic/claude-3-sonnet", "url": "https://huggingface.co/anthropic/claude-3-sonnet", "downloads": 980000, "stars": 3850},
-        {"modelId": "mistralai/Mistral-7B-v2", "url": "https://huggingface.co/mistralai/Mistral-7B-v2", "downloads": 830000, "stars": 3200},
-        {"modelId": "openchat/openchat-3.7", "url": "https://huggingface.co/openchat/openchat-3.7", "downloads": 720000, "stars": 2950},
-        {"modelId": "stabilityai/stable-diffusion-3", "url": "https://huggingface.co/stabilityai/stable-diffusion-3", "downloads": 650000, "stars": 2780}
-    ]
-    
-    return hf_models
-
-# Display models in a clearer format
-hf_models = generate_trending_models()
-github_trending = [
-    {"name": "microsoft/promptflow", "description": "Build high-quality LLM apps - from prototyping, testing to production deployment and monitoring.", "stars": 15200},
-    {"name": "vercel/ai-toolkit", "description": "Open source tools for building AI applications with React and JavaScript.", "stars": 12800},
-    {"name": "deepseek-ai/DeepSeek-Coder", "description": "DeepSeek Coder: Let the Code Write Itself", "stars": 9700},
-    {"name": "anthropic/claude-sdk", "description": "Official SDK for building with Claude models", "stars": 7500},
-    {"name": "lllyasviel/stable-diffusion-webui-directml", "description": "DirectML backend for Stable Diffusion web UI", "stars": 6200}
-]
-
-# Use tabs for better organization
-hf_tab, gh_tab = st.tabs(["🔥 Hugging Face Trending", "⚡ GitHub Trending"])
-
-with hf_tab:
-    for model in hf_models:
-        with st.container():
-            col1, col2 = st.columns([4, 1])
-            with col1:
-                st.markdown(f"### [{model['modelId']}]({model['url']})")
-            with col2:
-                st.markdown(f"⭐ {model['stars']}")
-            
-            col1, col2 = st.columns([1, 4])
-            with col1:
-                st.markdown(f"⬇️ **Downloads:**")
-            with col2:
-                st.markdown(f"{model['downloads']:,}")
-            
-            st.markdown("---")
-
-with gh_tab:
-    for repo in github_trending:
-        with st.container():
-            col1, col2 = st.columns([4, 1])
-            with col1:
-                st.markdown(f"### [{repo['name']}](https://github.com/{repo['name']})")
-            with col2:
-                st.markdown(f"⭐ {repo['stars']}")
-            
-            st.markdown(f"**Description:** {repo['description']}")
-            st.markdown("---")
-
-# --- Recent Papers Section ---
-st.markdown('<h2 class="sub-header">📄 Recent Research</h2>', unsafe_allow_html=True)
-st.markdown("Explore the latest research papers in AI and machine learning:")
-
-papers = [
-    {
-        "title": "LLM-Based Reasoning for Code Generation: A Comprehensive Survey",
-        "authors": "Chen et al.",
-        "conference": "ICML 2025",
-        "link": "https://arxiv.org/abs/2405.12345",
-        "date": "April 2025"
-    },
-    {
-        "title": "Adaptive Multimodal Models for Real-Time UI Generation",
-        "authors": "Park, Johnson & Zhang",
-        "conference": "CHI 2025",
-        "link": "https://arxiv.org/abs/2404.54321",
-        "date": "March 2025"
-    },
-    {
-        "title": "Self-Evolving Neural Architectures for Visual Design Synthesis",
-        "authors": "Wong & Patel",
-        "conference": "CVPR 2025",
-        "link": "https://arxiv.org/abs/2403.98765",
-        "date": "March 2025"
-    }
-]
+# Growth tab: series label -> (history kind, metric)
+GROWTH_SERIES = {
+    "Hugging Face Downloads": ("hf_model", "downloads"),
+    "Hugging Face Likes": ("hf_model", "stars"),
+    "GitHub Stars": ("repo", "stars"),
+    "Tool Users": ("tool", "users"),
+}
+GROWTH_WINDOWS = [7, 30, 90, 365]
+GROWTH_TOP = 10
+
+with profiler.section("trending"):
+    st.markdown('<h2 class="sub-header">📈 Trending AI Models</h2>', unsafe_allow_html=True)
+
+    # Fetched by the background refresher; reruns only read the snapshot
+    hf_feed = snapshot.trending["hf_models"]
+    gh_feed = snapshot.trending["github_trending"]
+    hf_models = hf_feed.data
+    github_trending = gh_feed.data
+
+    def feed_caption(feed):
+        if not feed.live:
+            status = "Sample data, live refresh pending"
+        else:
+            status = f"Live data fetched {feed.fetched_at.strftime('%H:%M')}"
+        if feed.error:
+            status += f" (last refresh failed: {feed.error})"
+        st.caption(status)
+
+    # Use tabs for better organization
+    hf_tab, gh_tab, growth_tab = st.tabs(["🔥 Hugging Face Trending", "⚡ GitHub Trending", "🚀 Growth"])
+
+    with hf_tab:
+        feed_caption(hf_feed)
+        for model in hf_models:
+            with st.container():
+                col1, col2 = st.columns([4, 1])
+                with col1:
+                    st.markdown(f"### [{model['modelId']}]({model['url']})")
+                with col2:
+                    st.markdown(f"⭐ {model['stars']}")
 
-for paper in papers:
-    with st.expander(f"{paper['title']} ({paper['date']})"):
-        st.markdown(f"""
-        **Authors:** {paper['authors']}  
-        **Conference:** {paper['conference']}  
-        **Link:** [{paper['link']}]({paper['link']})
-        
-        **Abstract:** This paper presents novel approaches to {paper['title'].lower().split('for')[0]} 
-        with applications in {paper['title'].lower().split('for')[1] if 'for' in paper['title'].lower() else 'AI systems'}.
-        """)
+                col1, col2 = st.columns([1, 4])
+                with col1:
+                    st.markdown(f"⬇️ **Downloads:**")
+                with col2:
+                    st.markdown(f"{model['downloads']:,}")
+
+                st.markdown("---")
+
+    with gh_tab:
+        feed_caption(gh_feed)
+        for repo in github_trending:
+            with st.container():
+                col1, col2 = st.columns([4, 1])
+                with col1:
+                    st.markdown(f"### [{repo['name']}](https://github.com/{repo['name']})")
+                with col2:
+                    st.markdown(f"⭐ {repo['stars']}")
+
+                st.markdown(f"**Description:** {repo['description']}")
+                st.markdown("---")
+
+    with growth_tab:
+        # Read from the history rollups; figures are cached until a new sample lands
+        history = snapshot.history
+        series_col, window_col = st.columns([2, 3])
+        with series_col:
+            growth_series = st.selectbox("Series", list(GROWTH_SERIES), key="growth_series")
+        with window_col:
+            growth_days = st.radio("Window", GROWTH_WINDOWS, format_func=lambda days: f"{days} days",
+                                   horizontal=True, key="growth_days")
+        kind, metric = GROWTH_SERIES[growth_series]
+        history_version = history.version()
+        fastest = functools.cache(lambda: history.growth(kind, metric, growth_days).head(GROWTH_TOP))
+
+        bar_col, line_col = st.columns(2)
+        with bar_col:
+            key = chart_key(history_version, "growth_bar", kind=kind, metric=metric, days=growth_days)
+            fig = get_figure_cache().get(key, lambda: growth_bar(fastest(), f"Fastest Growing {growth_series}"))
+            st.plotly_chart(fig, use_container_width=True)
+        with line_col:
+            key = chart_key(history_version, "history_lines", kind=kind, metric=metric, days=growth_days)
+            fig = get_figure_cache().get(key, lambda: history_lines(
+                history.series(kind, metric, fastest()["ref"], growth_days), metric, f"{growth_series} over time"))
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption("Growth compares each series with its value at the start of the window. "
+                   "History starts when the dashboard first records a series.")
+
+# --- Recent Papers Section (paged out of the local full-text index) ---
+PAPERS_PER_PAGE = 10
+
+@st.fragment(key="papers")
+def recent_papers(papers):
+    """Searchable, paginated papers list; paging or searching reruns only this fragment."""
+    fragment_rerun = is_fragment_rerun()
+    run_profiler = RerunProfiler(get_metrics_store(), scope="papers") if fragment_rerun else profiler
+
+    with run_profiler.section("papers"):
+        st.markdown('<h2 class="sub-header">📄 Recent Research</h2>', unsafe_allow_html=True)
+        st.markdown("Explore the latest research papers in AI and machine learning:")
+
+        paper_query = st.text_input("🔍 Search papers by title, author or abstract", key="paper_query")
+        if st.session_state.get("paper_page_key") != normalize_query(paper_query):
+            st.session_state.paper_page_key = normalize_query(paper_query)
+            st.session_state.paper_page = 0
+
+        def change_paper_page(delta):
+            st.session_state.paper_page += delta
+
+        page = st.session_state.paper_page
+        matches, total = papers.search(paper_query, PAPERS_PER_PAGE, page * PAPERS_PER_PAGE)
+        page, start, stop, page_count = page_bounds(total, page, PAPERS_PER_PAGE)
+
+        if not matches:
+            st.info("No papers match this search." if paper_query else "No papers have been ingested yet.")
+        for paper in matches:
+            with st.expander(f"{paper['title']} ({paper['published'][:10] or 'undated'})"):
+                st.markdown(
+                    f"**Authors:** {paper['authors'] or '—'}  \n"
+                    f"**Venue:** {paper['venue'] or '—'}  \n"
+                    f"**Link:** [{paper['link']}]({paper['link']})\n\n"
+                    f"{paper['abstract'] or '*No abstract available.*'}"
+                )
+
+        if page_count > 1:
+            prev_col, page_col, next_col = st.columns([1, 2, 1])
+            with prev_col:
+                st.button("◀ Previous", on_click=change_paper_page, args=(-1,), disabled=page == 0, key="papers_prev")
+            with page_col:
+                st.markdown(f"Page {page + 1} of {page_count} · papers {start + 1}-{stop} of {total}")
+            with next_col:
+                st.button("Next ▶", on_click=change_paper_page, args=(1,), disabled=page + 1 >= page_count,
+                          key="papers_next")
+
+    if fragment_rerun:
+        run_profiler.finish()
+
+recent_papers(snapshot.papers)
 
 
 # --- Footer ---
-st.markdown('<div class="footer">', unsafe_allow_html=True)
-st.markdown("© 2025 AI Trends & Tools Dashboard | Data refreshed daily | Created with Streamlit")
-st.markdown("</div>", unsafe_allow_html=True)
-
-# Add a disclaimer
-st.markdown("""
----
-*Disclaimer: This dashboard is for informational purposes only. Tool ratings and metrics are based on community feedback and public data.*
-""")
+with profiler.section("footer"):
+    st.markdown('<div class="footer">', unsafe_allow_html=True)
+    st.markdown("© 2025 AI Trends & Tools Dashboard | Data refreshed daily | Created with Streamlit")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # Add a disclaimer
+    st.markdown("""
+    ---
+    *Disclaimer: This dashboard is for informational purposes only. Tool ratings and metrics are based on community feedback and public data.*
+    """)
+
+# --- Debug Panel (hidden, open with ?debug=1) ---
+rerun_metrics = profiler.finish()
+if st.query_params.get("debug") == "1":
+    with st.expander("🐞 Render timings", expanded=True):
+        st.markdown(f"**This rerun:** {rerun_metrics['total_ms']:.1f} ms")
+        st.dataframe(rerun_metrics["sections"], use_container_width=True)
+        st.markdown("**Recent reruns (ms)**")
+        summary = get_metrics_store().summary()
+        st.dataframe([{"section": name, **stats} for name, stats in summary.items()], use_container_width=True)
+        result_cache = get_result_cache()
+        st.markdown(f"**Result cache:** {result_cache.hits} hits · {result_cache.misses} misses · "
+                    f"{len(result_cache)} entries ({result_cache.nbytes / 1024:.0f} KiB)")
+        governor = get_render_governor()
+        st.markdown(f"**Render governor:** {governor.active}/{governor.limit} slots busy · {governor.waiting} waiting · "
+                    f"{governor.shed} shed · outbound {OUTBOUND.active}/{OUTBOUND.limit} busy, "
+                    f"{OUTBOUND.waiting} waiting, {OUTBOUND.shed} shed, {HOST_LIMITER.throttled} throttled")
@@ -0,0 +1,231 @@
+"""Headless rerun benchmark for aitrend.py.
+
+Runs the dashboard under ``streamlit.testing.v1.AppTest`` (no browser)
+against synthetic catalogs, replays a scripted sequence of sidebar
+interactions and reports per-action rerun latency (wall and CPU) plus peak
+Python memory as JSON. Interactions replay as fragment reruns of the tool
+explorer, as a browser sends them; ``--scope app`` forces full reruns for a
+before/after comparison. Logo downloads, trending API calls and paper feeds
+are stubbed, so no network access is needed, and every on-disk store
+(history, papers, vectors, warm start, snapshots, logos) lives in a temporary
+directory rather than the dashboard's real ``~/.cache/aitrend``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_app --sizes 1000 20000 --skew 1.2 --output bench.json
+    python -m benchmarks.bench_app --baseline bench.json   # exit 1 on p95 regressions
+    python -m benchmarks.bench_app --scope app             # full reruns only
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_tools, write_jsonl
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "aitrend.py")
+# Every widget in INTERACTIONS lives in this fragment.
+FRAGMENT_KEY = "tool_explorer"
+
+# (action label, widget key, value) replayed in order after the initial run.
+INTERACTIONS = [
+    *[("type_search", "search_query", "code generation"[:n]) for n in range(1, 8)],
+    ("clear_search", "search_query", ""),
+    ("toggle_category", "category_filter", ["Design"]),
+    ("toggle_category", "category_filter", ["Design", "LLM"]),
+    ("toggle_category", "category_filter", []),
+    *[("sort_by", "sort_by", mode) for mode in ["Rating", "Name", "Recently Added", "Popularity"]],
+    *[("view_mode", "view_mode", mode) for mode in ["Compact", "Table", "Cards"]],
+]
+
+
+def state_env(directory):
+    """``AITREND_*`` variables pointing every persistent store of the app into ``directory``."""
+    return {
+        "AITREND_SNAPSHOT_DIR": os.path.join(directory, "snapshots"),
+        "AITREND_WARM_START": os.path.join(directory, "warmstart.pickle"),
+        "AITREND_HISTORY_DB": os.path.join(directory, "history.sqlite"),
+        "AITREND_PAPERS_DB": os.path.join(directory, "papers.sqlite"),
+        "AITREND_VECTOR_DIR": os.path.join(directory, "vectors"),
+        "AITREND_LOGO_CACHE": os.path.join(directory, "logos"),
+    }
+
+
+@contextlib.contextmanager
+def isolated_state(directory):
+    """Point the app's stores into ``directory``; must run before the app modules are imported."""
+    loaded = [name for name in ("catalog", "history", "logos", "papers", "semantic", "warmstart") if name in sys.modules]
+    if loaded:
+        raise RuntimeError(f"app modules already imported, their defaults would ignore the temp dir: {loaded}")
+    original = dict(os.environ)
+    os.environ.update(state_env(directory))
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(original)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+@contextlib.contextmanager
+def offline():
+    """Stub out every outbound call the app makes."""
+    import base64
+
+    import logos
+    import papers
+    import trending
+
+    stub_png = base64.b64decode("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII=")
+    original_load = logos.LogoCache._load
+    original_refresh = trending.TrendingStore.refresh
+    original_ingest = papers.PaperStore.ingest
+    logos.LogoCache._load = lambda self, url: self._store(url, "stub", stub_png)
+    trending.TrendingStore.refresh = lambda self, names=None, wait=False, force=False: []
+    papers.PaperStore.ingest = lambda self: {}
+    try:
+        yield
+    finally:
+        logos.LogoCache._load = original_load
+        trending.TrendingStore.refresh = original_refresh
+        papers.PaperStore.ingest = original_ingest
+
+
+@contextlib.contextmanager
+def fragment_scoped(at, fragment_key):
+    """Make ``at``'s reruns target only ``fragment_key``, like a widget change inside it."""
+    from streamlit.testing.v1 import local_script_runner
+
+    original = local_script_runner.RerunData
+    fragment_ids = at._fragment_storage.resolve_target(fragment_key)
+    local_script_runner.RerunData = functools.partial(original, fragment_id_queue=fragment_ids)
+    try:
+        yield
+    finally:
+        local_script_runner.RerunData = original
+
+
+def set_widget(at, key, value):
+    for widget in (at.text_input, at.multiselect, at.selectbox, at.radio, at.slider):
+        try:
+            return widget(key=key).set_value(value)
+        except KeyError:
+            continue
+    raise KeyError(key)
+
+
+def replay(catalog_path, repeat, timeout, scope="fragment"):
+    """Run the interaction script ``repeat`` times; return per-action samples in ms."""
+    import catalog
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    catalog.DEFAULT_CATALOG_PATH = catalog_path
+    st.cache_resource.clear()
+    samples = {}
+
+    def timed_run(action, at):
+        wall, cpu = time.perf_counter(), time.process_time()
+        at.run(timeout=timeout)
+        wall_ms = (time.perf_counter() - wall) * 1000
+        cpu_ms = (time.process_time() - cpu) * 1000
+        if at.exception:
+            raise RuntimeError(f"{action}: {at.exception[0].value}")
+        samples.setdefault(action, {"wall": [], "cpu": []})
+        samples[action]["wall"].append(wall_ms)
+        samples[action]["cpu"].append(cpu_ms)
+
+    for iteration in range(repeat):
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        timed_run("cold_start" if iteration == 0 else "first_run", at)
+        rerun_scope = fragment_scoped(at, FRAGMENT_KEY) if scope == "fragment" else contextlib.nullcontext()
+        with rerun_scope:
+            for action, key, value in INTERACTIONS:
+                set_widget(at, key, value)
+                timed_run(action, at)
+    return samples
+
+
+def peak_memory_mb(catalog_path, timeout, scope):
+    tracemalloc.start()
+    try:
+        replay(catalog_path, 1, timeout, scope)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, skew, repeat, timeout, measure_memory, scope="fragment"):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, isolated_state(os.path.join(tmp, "state")), offline():
+        for size in sizes:
+            catalog_path = os.path.join(tmp, f"catalog-{size}.jsonl")
+            write_jsonl(make_tools(size, skew=skew), catalog_path)
+            samples = replay(catalog_path, repeat, timeout, scope)
+            row = {"size": size, "skew": skew, "scope": scope, "actions": {}}
+            for action, values in samples.items():
+                row["actions"][action] = {
+                    "n": len(values["wall"]),
+                    "p50_ms": round(percentile(values["wall"], 0.5), 2),
+                    "p95_ms": round(percentile(values["wall"], 0.95), 2),
+                    "max_ms": round(max(values["wall"]), 2),
+                    "mean_cpu_ms": round(statistics.fmean(values["cpu"]), 2),
+                }
+            if measure_memory:
+                row["peak_memory_mb"] = round(peak_memory_mb(catalog_path, timeout, scope), 1)
+            results.append(row)
+            print(json.dumps(row), file=sys.stderr)
+    return {"created": time.time(), "python": sys.version.split()[0], "results": results}
+
+
+def regressions(report, baseline, tolerance):
+    """p95 latencies that got worse than ``baseline`` by more than ``tolerance``."""
+    previous = {(row["size"], row["skew"]): row for row in baseline["results"]}
+    found = []
+    for row in report["results"]:
+        before = previous.get((row["size"], row["skew"]))
+        if before is None:
+            continue
+        for action, stats in row["actions"].items():
+            old = before["actions"].get(action)
+            if old and stats["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+                found.append(f"size={row['size']} {action}: p95 {old['p95_ms']} -> {stats['p95_ms']} ms")
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent for category popularity")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--scope", choices=["fragment", "app"], default="fragment",
+                        help="rerun only the tool explorer fragment per interaction, or the whole app")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON report to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.skew, args.repeat, args.timeout, args.memory, args.scope)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            problems = regressions(report, json.load(fh), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        sys.exit(1 if problems else 0)
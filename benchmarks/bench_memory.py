@@ -0,0 +1,66 @@
+"""Per-tool memory of the catalog representations.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_memory --size 100000
+
+Measures the bytes allocated per tool for the old list-of-dicts
+representation (ISO date strings, category lists) and for everything a
+loaded catalog keeps resident: the Arrow table, the ``ToolRecords`` arrays,
+the ``SearchIndex`` and the ``ToolQueryEngine``. Python and NumPy
+allocations are counted with tracemalloc, Arrow buffers through pyarrow's
+memory pool. ``total_bytes_per_tool`` is the figure to compare against the
+dicts; ``record_reduction`` only covers the records.
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+import pyarrow as pa
+
+from benchmarks.synthetic import CATEGORIES, make_tools
+from catalog import build_table
+from engine import ToolQueryEngine
+from records import CategoryVocabulary, records_from_table
+from search import SearchIndex
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes()
+        value = build()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - before
+    finally:
+        tracemalloc.stop()
+
+
+def run(size):
+    serialized = json.dumps(make_tools(size))
+    # Parse from JSON so neither representation shares strings with the generator.
+    dicts, dict_bytes = measure(lambda: json.loads(serialized))
+    table, arrow_bytes = measure(lambda: build_table(dicts))
+    records, record_bytes = measure(lambda: records_from_table(table, CategoryVocabulary(CATEGORIES)))
+    index, index_bytes = measure(lambda: SearchIndex(records, CATEGORIES))
+    _, engine_bytes = measure(lambda: ToolQueryEngine(table, index))
+    total_bytes = arrow_bytes + record_bytes + index_bytes + engine_bytes
+    return {
+        "size": size,
+        "dict_bytes_per_tool": round(dict_bytes / size, 1),
+        "arrow_bytes_per_tool": round(arrow_bytes / size, 1),
+        "record_bytes_per_tool": round(record_bytes / size, 1),
+        "index_bytes_per_tool": round(index_bytes / size, 1),
+        "engine_bytes_per_tool": round(engine_bytes / size, 1),
+        "total_bytes_per_tool": round(total_bytes / size, 1),
+        "record_reduction": round(dict_bytes / record_bytes, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.size), indent=2))
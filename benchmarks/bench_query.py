@@ -0,0 +1,123 @@
+"""Compare the vectorized query engine with the original dict-walking functions.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_query --sizes 1000 100000 1000000
+
+For every catalog size and sidebar scenario it times one full rerun's worth
+of work (filter, sort, the four overview metrics and the category
+histogram), reports the median of ``--repeat`` runs in milliseconds and
+checks that both implementations return the same tools in the same order.
+``topk_ms`` times the engine producing just the first page of ids from its
+precomputed sort order.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.synthetic import CATEGORIES, make_tools
+from catalog import build_table
+from engine import ToolQueryEngine
+from records import CategoryVocabulary, records_from_table
+from search import SearchIndex
+
+SCENARIOS = [
+    {"query": "", "categories": [], "min_rating": 3.5, "sort_by": "Popularity"},
+    {"query": "builder", "categories": [], "min_rating": 1.0, "sort_by": "Rating"},
+    {"query": "code", "categories": ["Design", "LLM"], "min_rating": 3.5, "sort_by": "Name"},
+    {"query": "", "categories": ["Vision"], "min_rating": 4.5, "sort_by": "Recently Added"},
+]
+PAGE_SIZE = 24
+
+
+# --- The pre-engine implementation, kept verbatim as the baseline ---
+def filter_tools(tools, query, categories, min_rating):
+    filtered = []
+    for tool in tools:
+        if query.lower() in tool["name"].lower() or query.lower() in tool["description"].lower():
+            if (not categories or any(cat in tool["category"] for cat in categories)) and tool["rating"] >= min_rating:
+                filtered.append(tool)
+    return filtered
+
+
+def sort_tools(tools, sort_by):
+    if sort_by == "Popularity":
+        return sorted(tools, key=lambda x: x["users"], reverse=True)
+    elif sort_by == "Rating":
+        return sorted(tools, key=lambda x: x["rating"], reverse=True)
+    elif sort_by == "Name":
+        return sorted(tools, key=lambda x: x["name"])
+    elif sort_by == "Recently Added":
+        return sorted(tools, key=lambda x: x["added"], reverse=True)
+    return tools
+
+
+def legacy_rerun(tools, scenario):
+    filtered = filter_tools(tools, scenario["query"], scenario["categories"], scenario["min_rating"])
+    ordered = sort_tools(filtered, scenario["sort_by"])
+    avg_rating = sum(tool["rating"] for tool in filtered) / len(filtered) if filtered else 0
+    total_users = sum(tool["users"] for tool in filtered)
+    category_counts = {}
+    for tool in tools:
+        for category in tool["category"]:
+            category_counts[category] = category_counts.get(category, 0) + 1
+    return [tool["name"] for tool in ordered], avg_rating, total_users, category_counts
+
+
+def engine_rerun(engine, scenario):
+    result = engine.query(scenario["query"], scenario["categories"], scenario["min_rating"], scenario["sort_by"])
+    metrics = engine.metrics(result)
+    category_counts = engine.category_counts()
+    return result["name"].tolist(), metrics["avg_rating"], metrics["total_users"], category_counts.to_dict()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), value
+
+
+def run(sizes, repeat, skew):
+    report = []
+    for size in sizes:
+        tools = make_tools(size, skew=skew)
+        started = time.perf_counter()
+        table = build_table(tools)
+        records = records_from_table(table, CategoryVocabulary(CATEGORIES))
+        engine = ToolQueryEngine(table, SearchIndex(records, CATEGORIES))
+        build_ms = (time.perf_counter() - started) * 1000
+        for scenario in SCENARIOS:
+            legacy_ms, expected = timed(lambda: legacy_rerun(tools, scenario), repeat)
+            engine_ms, actual = timed(lambda: engine_rerun(engine, scenario), repeat)
+            topk_ms, top = timed(lambda: engine.query_ids(limit=PAGE_SIZE, **scenario), repeat)
+            # The index also matches category names, so compare on the
+            # legacy result set and require identical ordering within it.
+            matched = set(expected[0])
+            same = [name for name in actual[0] if name in matched] == expected[0]
+            same_top = engine.frame["name"].to_numpy()[top].tolist() == actual[0][:PAGE_SIZE]
+            row = {
+                "size": size,
+                **scenario,
+                "build_ms": round(build_ms, 1),
+                "legacy_ms": round(legacy_ms, 2),
+                "engine_ms": round(engine_ms, 2),
+                "speedup": round(legacy_ms / engine_ms, 1) if engine_ms else None,
+                "topk_ms": round(topk_ms, 3),
+                "same_order": same and same_top,
+            }
+            report.append(row)
+            print(json.dumps(row))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skew", type=float, default=1.0)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.skew)
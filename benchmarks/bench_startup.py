@@ -0,0 +1,127 @@
+"""Startup benchmark for aitrend.py: import time and time to first render.
+
+Every measurement runs in a fresh interpreter, like a new server process. The
+``cold`` scenario starts with an empty warm-start cache; the process saves it
+at exit, and the ``warm`` scenario then boots from it. Each child reports how
+long importing the app's modules took, how long ``AppTest``'s first run took
+and which heavy third-party modules were loaded by then. Logos, trending feeds
+and paper feeds are stubbed, and every on-disk cache lives in a temporary
+directory.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_startup --sizes 1000 20000 --repeat 3 --output startup.json
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_app import state_env
+from benchmarks.synthetic import make_tools, write_jsonl
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules imported by aitrend.py itself, in its order.
+APP_MODULES = ["catalog", "charts", "engine", "export", "instrumentation", "logos", "refresher", "semantic",
+               "views", "warmstart"]
+HEAVY_MODULES = ["pandas", "plotly.express", "PIL.Image", "requests"]
+
+
+def loaded_heavy_modules():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def child(timeout):
+    """Measure this process's startup; print one JSON object on stdout."""
+    started = time.perf_counter()
+    import streamlit  # noqa: F401  (the server has it loaded before the script runs)
+    streamlit_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for name in APP_MODULES:
+        importlib.import_module(name)
+    import_ms = (time.perf_counter() - started) * 1000
+    heavy_after_import = loaded_heavy_modules()
+
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.bench_app import APP_PATH, offline
+
+    with offline():
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        started = time.perf_counter()
+        at.run()
+        first_render_ms = (time.perf_counter() - started) * 1000
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        started = time.perf_counter()
+        at.run()
+        rerun_ms = (time.perf_counter() - started) * 1000
+    print(json.dumps({
+        "streamlit_import_ms": round(streamlit_ms, 1),
+        "import_ms": round(import_ms, 1),
+        "first_render_ms": round(first_render_ms, 1),
+        "rerun_ms": round(rerun_ms, 1),
+        "heavy_after_import": heavy_after_import,
+        "heavy_after_render": loaded_heavy_modules(),
+    }))
+    # The warm-start cache is written by an atexit hook when this returns.
+
+
+def spawn(env, timeout):
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--timeout", str(timeout)],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(sizes, skew, repeat, timeout):
+    results = []
+    for size in sizes:
+        samples = {"cold": [], "warm": []}
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                catalog_path = os.path.join(tmp, "catalog.jsonl")
+                write_jsonl(make_tools(size, skew=skew), catalog_path)
+                env = dict(os.environ, AITREND_CATALOG=catalog_path, **state_env(tmp))
+                samples["cold"].append(spawn(env, timeout))
+                # The cold process saved its warm-start cache on exit; boot from it.
+                samples["warm"].append(spawn(env, timeout))
+        row = {"size": size, "skew": skew, "scenarios": {}}
+        for scenario, runs in samples.items():
+            row["scenarios"][scenario] = {
+                **{metric: round(statistics.median(run[metric] for run in runs), 1)
+                   for metric in ("streamlit_import_ms", "import_ms", "first_render_ms", "rerun_ms")},
+                "heavy_after_import": runs[-1]["heavy_after_import"],
+                "heavy_after_render": runs[-1]["heavy_after_render"],
+            }
+        results.append(row)
+        print(json.dumps(row), file=sys.stderr)
+    return {"created": time.time(), "python": sys.version.split()[0], "repeat": repeat, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent for category popularity")
+    parser.add_argument("--repeat", type=int, default=3, help="process pairs per size; medians are reported")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.timeout)
+        sys.exit(0)
+    report = run(args.sizes, args.skew, args.repeat, args.timeout)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
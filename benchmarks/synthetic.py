@@ -0,0 +1,48 @@
+"""Synthetic tool catalogs for the benchmarks.
+
+``make_tools(n, skew)`` returns ``n`` tool records shaped like the entries in
+``data/catalog.json``. ``skew`` is the Zipf exponent used to pick categories:
+0 spreads tools evenly, larger values pile most tools into the first few
+categories.
+"""
+import datetime
+import json
+import random
+
+CATEGORIES = ["Design", "Prototyping", "Automation", "LLM", "Vision", "Multimodal", "Code Generation", "Productivity"]
+PRICING = ["Free", "Freemium", "Subscription", "Free/Pro", "Pro/Team", "Team/Enterprise", "API/Enterprise"]
+WORDS = (
+    "ai assistant code generation design prototype website builder workflow automation "
+    "react tailwind components model vision image multimodal productivity team enterprise "
+    "open source api sdk agent chat editor ide refactor test deploy analytics search data"
+).split()
+
+
+def make_tools(n, skew=1.0, seed=0):
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) ** skew for rank in range(len(CATEGORIES))]
+    base_date = datetime.date(2023, 1, 1)
+    tools = []
+    for i in range(n):
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}"
+        categories = set(rng.choices(CATEGORIES, weights=weights, k=rng.randint(1, 3)))
+        added = base_date + datetime.timedelta(days=rng.randrange(900))
+        tools.append({
+            "name": name,
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(12, 30))).capitalize() + ".",
+            "link": f"https://tool{i}.example.com",
+            "category": sorted(categories, key=CATEGORIES.index),
+            "logo": f"https://tool{i}.example.com/favicon.ico",
+            "rating": round(rng.uniform(1.0, 5.0), 1),
+            "users": rng.randrange(100, 1_000_000),
+            "pricing": rng.choice(PRICING),
+            "added": added.isoformat(),
+            "updated": (added + datetime.timedelta(days=rng.randrange(200))).isoformat(),
+        })
+    return tools
+
+
+def write_jsonl(tools, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        for tool in tools:
+            fh.write(json.dumps(tool) + "\n")
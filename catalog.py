@@ -0,0 +1,245 @@
+"""Tool catalog loading and columnar snapshots.
+
+The catalog source is a JSON, JSONL, CSV or Parquet file (``data/catalog.json`` is the
+bundled default). Loading compiles it into a typed Arrow IPC snapshot named
+after the source's content hash, so the expensive parse only happens once per
+distinct source and later loads just memory-map the snapshot.
+
+JSON sources are either a list of tool records or an object with ``tools``,
+``hf_models``, ``github_trending`` and ``papers`` lists. JSONL and CSV sources
+hold one tool per line/row; JSONL lines may carry a ``"_section"`` key to
+target one of the other sections instead. In CSV files ``category`` is a
+``|``-separated list. Parquet sources hold the tool columns as exported by the
+dashboard. Sections missing from a source fall back to the bundled defaults.
+"""
+import csv
+import datetime
+import hashlib
+import json
+import os
+import sys
+import time
+
+import pyarrow as pa
+
+from records import CategoryVocabulary, records_from_table
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_CATALOG_PATH = os.environ.get("AITREND_CATALOG", os.path.join(DATA_DIR, "catalog.json"))
+DEFAULT_SNAPSHOT_DIR = os.environ.get(
+    "AITREND_SNAPSHOT_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "aitrend", "snapshots"),
+)
+
+# Bump whenever the snapshot layout changes so stale files are not reused.
+SNAPSHOT_FORMAT = "1"
+SECTIONS = ("hf_models", "github_trending", "papers")
+# Sidebar filter options; also the first bits of every catalog's category vocabulary.
+CATEGORY_OPTIONS = ["Design", "Prototyping", "Automation", "LLM", "Vision", "Multimodal", "Code Generation", "Productivity"]
+
+TOOL_SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("description", pa.string()),
+    ("link", pa.string()),
+    ("category", pa.list_(pa.string())),
+    ("logo", pa.string()),
+    ("rating", pa.float64()),
+    ("users", pa.int64()),
+    ("pricing", pa.dictionary(pa.int16(), pa.string())),
+    ("added", pa.date32()),
+    ("updated", pa.date32()),
+])
+
+
+class CatalogError(ValueError):
+    pass
+
+
+class Catalog:
+    """An immutable, loaded catalog snapshot."""
+
+    def __init__(self, table, sections, version, source_path=None, snapshot_path=None):
+        self.table = table
+        self.version = version
+        self.source_path = source_path
+        self.snapshot_path = snapshot_path
+        self.hf_models = sections.get("hf_models", [])
+        self.github_trending = sections.get("github_trending", [])
+        self.papers = sections.get("papers", [])
+        self.built_at = datetime.datetime.now()
+        self.vocabulary = CategoryVocabulary(CATEGORY_OPTIONS)
+        self._tools = None
+
+    @property
+    def tools(self):
+        """Read-only ``ToolRecords`` view of the table, built on first access."""
+        if self._tools is None:
+            self._tools = records_from_table(self.table, self.vocabulary)
+        return self._tools
+
+    @tools.setter
+    def tools(self, tools):
+        """Adopt records built earlier for this catalog version (warm-start cache)."""
+        tools.attach(self.table)
+        self._tools = tools
+        self.vocabulary = tools.vocabulary
+
+    def __len__(self):
+        return self.table.num_rows
+
+
+# --- Source parsing ---
+def source_stamp(path):
+    """Cheap change detector for a source file: ``(mtime_ns, size)``."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_source(path):
+    """Parse ``path`` into ``(tool_records, sections)``."""
+    ext = os.path.splitext(path)[1].lower()
+    sections = {}
+    if ext == ".json":
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        if isinstance(data, list):
+            tools = data
+        else:
+            tools = data.get("tools", [])
+            sections = {name: data[name] for name in SECTIONS if name in data}
+    elif ext == ".jsonl":
+        tools = []
+        with open(path, encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise CatalogError(f"{path}:{line_no}: {exc}") from exc
+                section = record.pop("_section", "tools")
+                if section == "tools":
+                    tools.append(record)
+                else:
+                    sections.setdefault(section, []).append(record)
+    elif ext == ".csv":
+        with open(path, encoding="utf-8", newline="") as fh:
+            tools = [_csv_record(row) for row in csv.DictReader(fh)]
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+
+        try:
+            tools = pq.read_table(path).to_pylist()
+        except pa.ArrowException as exc:
+            raise CatalogError(f"{path}: {exc}") from exc
+    else:
+        raise CatalogError(f"Unsupported catalog format: {path}")
+    return tools, sections
+
+
+def _csv_record(row):
+    record = dict(row)
+    record["category"] = [c.strip() for c in (row.get("category") or "").split("|") if c.strip()]
+    record["rating"] = float(row.get("rating") or 0)
+    record["users"] = int(row.get("users") or 0)
+    return record
+
+
+def _parse_date(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def build_table(records):
+    """Compile tool records into a typed Arrow table."""
+    columns = {field.name: [] for field in TOOL_SCHEMA}
+    for i, record in enumerate(records):
+        try:
+            columns["name"].append(str(record["name"]))
+            columns["description"].append(record.get("description", ""))
+            columns["link"].append(record.get("link", ""))
+            columns["category"].append(list(record.get("category") or []))
+            columns["logo"].append(record.get("logo"))
+            columns["rating"].append(float(record.get("rating") or 0))
+            columns["users"].append(int(record.get("users") or 0))
+            columns["pricing"].append(record.get("pricing", ""))
+            columns["added"].append(_parse_date(record.get("added")))
+            columns["updated"].append(_parse_date(record.get("updated")))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise CatalogError(f"Invalid tool record #{i}: {exc}") from exc
+    arrays = [pa.array(columns[field.name], type=field.type) for field in TOOL_SCHEMA]
+    return pa.Table.from_arrays(arrays, schema=TOOL_SCHEMA)
+
+
+# --- Snapshots ---
+def write_snapshot(table, sections, path, version):
+    metadata = {
+        b"aitrend.version": version.encode("utf-8"),
+        b"aitrend.sections": json.dumps(sections, ensure_ascii=False).encode("utf-8"),
+    }
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def open_snapshot(path, source_path=None):
+    """Memory-map a snapshot written by :func:`write_snapshot`."""
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    metadata = table.schema.metadata or {}
+    version = metadata.get(b"aitrend.version", b"").decode("utf-8")
+    sections = json.loads(metadata.get(b"aitrend.sections", b"{}"))
+    return Catalog(table.replace_schema_metadata(None), sections, version,
+                   source_path=source_path, snapshot_path=path)
+
+
+def _default_sections():
+    default_path = os.path.join(DATA_DIR, "catalog.json")
+    _, sections = read_source(default_path)
+    return sections
+
+
+def load_catalog(path=DEFAULT_CATALOG_PATH, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """Load the catalog at ``path``, reusing an existing snapshot if the content is unchanged."""
+    version = f"{SNAPSHOT_FORMAT}-{file_digest(path)[:16]}"
+    snapshot_path = None
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        snapshot_path = os.path.join(snapshot_dir, f"{stem}-{version}.arrow")
+        if os.path.exists(snapshot_path):
+            try:
+                return open_snapshot(snapshot_path, source_path=path)
+            except (OSError, pa.ArrowInvalid):
+                pass  # Corrupt or truncated snapshot; rebuild below.
+
+    records, sections = read_source(path)
+    for name, default in _default_sections().items():
+        sections.setdefault(name, default)
+    table = build_table(records)
+    if snapshot_path is None:
+        return Catalog(table, sections, version, source_path=path)
+    write_snapshot(table, sections, snapshot_path, version)
+    return open_snapshot(snapshot_path, source_path=path)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CATALOG_PATH
+    started = time.perf_counter()
+    catalog = load_catalog(source)
+    print(f"{catalog.snapshot_path}: {len(catalog)} tools, version {catalog.version}, "
+          f"{time.perf_counter() - started:.3f}s")
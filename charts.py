@@ -0,0 +1,164 @@
+"""Memoized Plotly figures for the dashboard.
+
+Building a figure with ``plotly.express`` costs far more than drawing it, so
+figures are cached process-wide (shared by every session) under a key made
+of the catalog version, the chart name and its parameters. Entries hold the
+figure objects themselves; JSON is only produced when the cache is exported.
+
+New charts plug in by picking a name and passing a builder to
+:meth:`FigureCache.get`; everything the figure depends on must be part of
+``params``.
+
+Plotly is imported by the first figure built, not at import time. The
+cache's figures can be exported as JSON specs and restored (warm-start
+cache), in which case a restored figure is rebuilt from its JSON instead of
+by its builder.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def chart_key(version, name, **params):
+    return (version, name, tuple(sorted(params.items())))
+
+
+class FigureCache:
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> figure, or its JSON spec while only restored
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the cached figure for ``key``, calling ``build()`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if not isinstance(entry, str):
+                    return entry
+            else:
+                self.misses += 1
+
+        if entry is not None:
+            import plotly.io as pio
+
+            figure = pio.from_json(entry, skip_invalid=True)
+        else:
+            figure = build()
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figure
+
+    def specs(self):
+        """``{key: figure JSON}`` of every entry, least recently used first (serialized only now)."""
+        import plotly.io as pio
+
+        with self._lock:
+            entries = list(self._entries.items())
+        return {key: entry if isinstance(entry, str) else pio.to_json(entry, validate=False)
+                for key, entry in entries}
+
+    def restore(self, specs):
+        """Seed the cache with :meth:`specs` output; figures are rebuilt from JSON on first use."""
+        with self._lock:
+            for key, spec in specs.items():
+                self._entries.setdefault(key, spec)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class IncrementalCategoryCounts:
+    """Per-session category histogram over the filtered tools.
+
+    Keeps the previous selection as a boolean mask and, when the filters
+    change, only adds the counts of newly selected tools and subtracts those
+    of dropped ones. Falls back to a full count when most of the selection
+    changed anyway.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.selected = np.zeros(len(engine), dtype=bool)
+        self.counts = np.zeros(len(engine.category_labels), dtype=np.int64)
+
+    def update(self, doc_ids):
+        selected = np.zeros(len(self.engine), dtype=bool)
+        selected[np.asarray(doc_ids, dtype=np.int64)] = True
+        added = np.flatnonzero(selected & ~self.selected)
+        removed = np.flatnonzero(self.selected & ~selected)
+        if len(added) + len(removed) > len(doc_ids):
+            self.counts = self.engine.category_code_counts(np.flatnonzero(selected))
+        else:
+            self.counts = (self.counts
+                           + self.engine.category_code_counts(added)
+                           - self.engine.category_code_counts(removed))
+        self.selected = selected
+        return self.as_series()
+
+    def as_series(self):
+        series = pd.Series(self.counts, index=pd.Index(self.engine.category_labels, name="category"))
+        return series[series > 0]
+
+
+# --- Chart builders ---
+def category_bar(category_counts, title):
+    import plotly.express as px
+
+    df_categories = pd.DataFrame({
+        'Category': category_counts.index.astype(str),
+        'Count': np.asarray(category_counts),
+    })
+    fig = px.bar(
+        df_categories,
+        x='Category',
+        y='Count',
+        color='Count',
+        color_continuous_scale='blues',
+        text='Count',
+        title=title
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+def growth_bar(growth, title):
+    """Horizontal bars of relative growth, fastest on top."""
+    import plotly.express as px
+
+    fig = px.bar(
+        growth.assign(percent=growth["growth"] * 100),
+        x='percent',
+        y='ref',
+        orientation='h',
+        color='percent',
+        color_continuous_scale='greens',
+        labels={'percent': 'Growth (%)', 'ref': ''},
+        hover_data={'latest': ':,', 'base': ':,'},
+        title=title
+    )
+    fig.update_layout(height=400, yaxis={'autorange': 'reversed'}, coloraxis_showscale=False)
+    return fig
+
+
+def history_lines(series, metric, title):
+    import plotly.express as px
+
+    fig = px.line(
+        series,
+        x='period',
+        y='value',
+        color='ref',
+        labels={'period': '', 'value': metric.title(), 'ref': ''},
+        title=title
+    )
+    fig.update_layout(height=400)
+    return fig
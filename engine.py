@@ -0,0 +1,261 @@
+"""Vectorized filter/sort/aggregate engine over the tool catalog.
+
+The catalog is kept as one DataFrame (categorical ``pricing``, datetime
+``added``/``updated``) whose row positions are the search index's document
+ids, plus an exploded ``(tool, category)`` frame with a categorical
+``category`` column. Filtering is a boolean mask and the overview metrics and
+category histogram are reductions/``groupby`` on those frames, so no step
+walks Python dicts.
+
+Every column sort is precomputed once per engine as a permutation of all
+document ids. A filtered result comes out already ordered as
+``order[mask[order]]``, and the first ``limit`` results only scan as much of
+the permutation as it takes to find them.
+"""
+import copy
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+
+# sort_by option -> (column, ascending)
+SORT_COLUMNS = {
+    "Popularity": ("users", False),
+    "Rating": ("rating", False),
+    "Name": ("name", True),
+    "Recently Added": ("added", False),
+}
+# Sorts by the per-tool growth rates attached with ToolQueryEngine.with_growth().
+GROWTH_SORT = "Fastest Growing"
+# Semantic search keeps at most this many tools, and only reasonably close ones.
+SEMANTIC_TOP_K = 200
+SEMANTIC_MIN_SCORE = 0.2
+# First block of the permutation scanned for a top-k query, in multiples of k.
+TOP_K_BLOCK = 4
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive form of a search, so equivalent inputs share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+def read_only(ids):
+    ids.flags.writeable = False
+    return ids
+
+
+def sort_orders(table):
+    """``{sort_by: permutation}`` for every ``SORT_COLUMNS`` entry, stable with nulls last."""
+    return {
+        sort_by: read_only(pc.array_sort_indices(
+            table.column(column), order="ascending" if ascending else "descending", null_placement="at_end",
+        ).to_numpy().astype(np.int64))
+        for sort_by, (column, ascending) in SORT_COLUMNS.items()
+    }
+
+
+def growth_order(growth):
+    """Permutation by descending growth, unknown rates last."""
+    return read_only(np.argsort(-np.nan_to_num(growth, nan=-np.inf), kind="stable"))
+
+
+class ToolQueryEngine:
+    def __init__(self, table, index):
+        self.index = index
+        self.frame = table.to_pandas(date_as_object=False).drop(columns="category")
+        self.frame.index = pd.RangeIndex(len(self.frame), name="tool")
+
+        categories = table.column("category").combine_chunks()
+        lengths = np.nan_to_num(categories.value_lengths().to_numpy(zero_copy_only=False)).astype(np.int64)
+        values = categories.flatten().to_pandas()
+        self.exploded = pd.DataFrame({
+            "tool": np.repeat(np.arange(len(self.frame)), lengths),
+            # First-appearance order keeps the histogram in catalog order.
+            "category": pd.Categorical(values, categories=pd.unique(values)),
+        })
+        # CSR view of the exploded frame: tool i owns codes[offsets[i]:offsets[i + 1]].
+        self.category_labels = list(self.exploded["category"].cat.categories)
+        self.category_codes = self.exploded["category"].cat.codes.to_numpy()
+        self.category_offsets = np.concatenate([[0], np.cumsum(lengths)])
+        self.orders = sort_orders(table)
+        self.growth = np.full(len(self.frame), np.nan)
+        self.orders[GROWTH_SORT] = growth_order(self.growth)
+        self.growth_version = None
+
+    def with_growth(self, growth, version):
+        """A copy sharing this engine's frames, with ``growth`` (one rate per tool, NaN if unknown)."""
+        engine = copy.copy(self)
+        engine.growth = np.asarray(growth, dtype=np.float64)
+        engine.orders = {**self.orders, GROWTH_SORT: growth_order(engine.growth)}
+        engine.growth_version = version
+        return engine
+
+    def __len__(self):
+        return len(self.frame)
+
+    # --- Filtering ---
+    def mask(self, query="", categories=(), min_rating=0.0):
+        mask = self.index.text_mask(query.strip()) if query.strip() else np.ones(len(self.frame), dtype=bool)
+        mask &= self.frame["rating"].to_numpy() >= min_rating
+        if categories:
+            mask &= self.index.category_mask(categories)
+        return mask
+
+    def filter(self, query="", categories=(), min_rating=0.0):
+        return self.frame[self.mask(query, categories, min_rating)]
+
+    # --- Sorting ---
+    def ordered_ids(self, mask, sort_by, limit=None):
+        """Ids where ``mask`` is set, in ``sort_by``'s precomputed order; only the first ``limit`` if given."""
+        order = self.orders[sort_by]
+        if limit is None:
+            return order[mask[order]]
+        # Top-k: scan the permutation in doubling blocks until enough ids matched
+        found, count, start, block = [], 0, 0, max(limit * TOP_K_BLOCK, 1024)
+        while count < limit and start < len(order):
+            chunk = order[start:start + block]
+            found.append(chunk[mask[chunk]])
+            count += len(found[-1])
+            start += block
+            block *= 2
+        return np.concatenate(found)[:limit] if found else order[:0]
+
+    def sort(self, frame, sort_by, query=""):
+        if sort_by in self.orders:
+            selected = np.zeros(len(self.frame), dtype=bool)
+            selected[frame.index.to_numpy()] = True
+            return frame.loc[self.ordered_ids(selected, sort_by)]
+        if sort_by == "Relevance" and query.strip() and len(frame):
+            scores = self.index.scores(query.strip(), frame.index.to_numpy())
+            return frame.iloc[np.argsort(-scores, kind="stable")]
+        return frame
+
+    def query(self, query="", categories=(), min_rating=0.0, sort_by="Popularity"):
+        return self.frame.iloc[self.query_ids(query, categories, min_rating, sort_by)]
+
+    def query_ids(self, query="", categories=(), min_rating=0.0, sort_by="Popularity", limit=None):
+        """Document ids of the filtered tools in display order (only the first ``limit`` if given).
+
+        ``limit`` suits callers that never need the full result; the dashboard
+        shows counts and metrics over every match, so it always asks for all ids.
+        """
+        mask = self.mask(query, categories, min_rating)
+        if sort_by in self.orders:
+            return read_only(self.ordered_ids(mask, sort_by, limit))
+        return read_only(self.sort(self.frame[mask], sort_by, query).index.to_numpy()[:limit])
+
+    def semantic_ids(self, vectors, query, categories=(), min_rating=0.0, sort_by="Relevance"):
+        """Tools closest in meaning to ``query``, from a synced ``semantic.VectorIndex``.
+
+        The index lists the catalog's tools first, in document id order.
+        Relevance keeps the similarity order; other sorts reorder the matches.
+        """
+        (ids, scores, _, _), = vectors.search([query], k=SEMANTIC_TOP_K, mask=self.mask("", categories, min_rating),
+                                              kinds=("tool",))
+        ids = ids[(scores >= SEMANTIC_MIN_SCORE) & (ids < len(self))]
+        if sort_by in self.orders:
+            selected = np.zeros(len(self), dtype=bool)
+            selected[ids] = True
+            ids = self.ordered_ids(selected, sort_by)
+        return read_only(ids)
+
+    def rows(self, ids, columns=None):
+        """The frame rows at ``ids`` (optionally just ``columns``), in that order."""
+        if columns is None:
+            return self.frame.iloc[ids]
+        return self.frame.iloc[ids, [self.frame.columns.get_loc(c) for c in columns]]
+
+    # --- Aggregates ---
+    @staticmethod
+    def metrics(frame):
+        return {
+            "count": len(frame),
+            "avg_rating": float(frame["rating"].mean()) if len(frame) else 0.0,
+            "total_users": int(frame["users"].sum()),
+        }
+
+    def metrics_for(self, ids):
+        """:meth:`metrics` straight from result ids, without materializing the rows."""
+        ratings = self.frame["rating"].to_numpy()[ids]
+        return {
+            "count": len(ids),
+            "avg_rating": float(ratings.mean()) if len(ids) else 0.0,
+            "total_users": int(self.frame["users"].to_numpy()[ids].sum()),
+        }
+
+    def category_counts(self, frame=None):
+        """Tools per category, over ``frame`` or the whole catalog."""
+        exploded = self.exploded
+        if frame is not None:
+            selected = np.zeros(len(self.frame), dtype=bool)
+            selected[frame.index.to_numpy()] = True
+            exploded = exploded[selected[exploded["tool"].to_numpy()]]
+        return exploded.groupby("category", observed=True).size()
+
+    def category_code_counts(self, doc_ids):
+        """Per-category counts (aligned with ``category_labels``) for ``doc_ids`` only.
+
+        Gathers just those tools' slices of the CSR arrays, so the cost is
+        proportional to ``len(doc_ids)`` rather than the catalog size.
+        """
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        starts = self.category_offsets[doc_ids]
+        lengths = self.category_offsets[doc_ids + 1] - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return np.bincount(self.category_codes[positions], minlength=len(self.category_labels))
+
+
+class ResultCache:
+    """Bounded LRU of ``query_ids`` results, shared by every session in the process.
+
+    Keys are ``(catalog version, normalized query, categories, min_rating,
+    sort_by, vector index version)``; the growth sort pairs the catalog
+    version with the engine's growth version. Values are read-only id arrays,
+    so one entry costs 8 bytes per matching tool.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(version, query, categories, min_rating, sort_by, vectors=None):
+        semantic = vectors.version if vectors is not None else None
+        return version, normalize_query(query), tuple(sorted(categories)), float(min_rating), sort_by, semantic
+
+    def get(self, engine, version, query="", categories=(), min_rating=0.0, sort_by="Popularity", vectors=None):
+        """Result ids for the query; semantic ones when ``vectors`` is given and the query is not empty."""
+        if sort_by == GROWTH_SORT:
+            version = (version, engine.growth_version)
+        key = self.key(version, query, categories, min_rating, sort_by, vectors)
+        with self._lock:
+            ids = self._entries.get(key)
+            if ids is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return ids
+            self.misses += 1
+
+        if vectors is not None and key[1]:
+            ids = engine.semantic_ids(vectors, key[1], key[2], key[3], key[4])
+        else:
+            ids = engine.query_ids(key[1], key[2], key[3], key[4])
+        with self._lock:
+            self._entries[key] = ids
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return ids
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(ids.nbytes for ids in self._entries.values())
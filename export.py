@@ -0,0 +1,87 @@
+"""Chunked export of a filtered/sorted tool list.
+
+Rows are gathered from the catalog's Arrow table a chunk at a time
+(:func:`iter_batches`) and written straight into a spooled temporary file, so
+exporting a million-row result never holds more than one chunk of rows as
+Python objects. The spool stays in memory for small exports and rolls over
+to disk for large ones.
+
+CSV output uses the same layout the catalog loader reads (``|``-separated
+categories) and JSONL/Parquet keep the list column, so every export can be
+loaded back with ``AITREND_CATALOG``.
+"""
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+CHUNK_ROWS = 50_000
+SPOOL_MAX_BYTES = 8 << 20
+
+# Format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "JSONL": ("jsonl", "application/x-ndjson"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def iter_batches(table, doc_ids, chunk_rows=CHUNK_ROWS):
+    """Yield ``table`` rows at ``doc_ids`` (in that order) as tables of at most ``chunk_rows``."""
+    doc_ids = np.asarray(doc_ids, dtype=np.int64)
+    for start in range(0, len(doc_ids), chunk_rows):
+        yield table.take(doc_ids[start:start + chunk_rows])
+
+
+def _as_strings(batch, names):
+    for name in names:
+        batch = batch.set_column(batch.schema.get_field_index(name), name, batch.column(name).cast(pa.string()))
+    return batch
+
+
+def _flatten(batch):
+    """CSV has no list or dictionary columns: join categories and decode pricing."""
+    batch = batch.set_column(batch.schema.get_field_index("category"), "category",
+                             pc.binary_join(batch.column("category"), "|"))
+    return _as_strings(batch, ["pricing"])
+
+
+def write_csv(batches, schema, sink):
+    import pyarrow.csv as pa_csv
+
+    with pa_csv.CSVWriter(sink, _flatten(schema.empty_table()).schema) as writer:
+        for batch in batches:
+            writer.write_table(_flatten(batch))
+
+
+def write_jsonl(batches, schema, sink):
+    for batch in batches:
+        if batch.num_rows:
+            # ISO dates and plain pricing strings, serialized by pandas in one call per chunk.
+            frame = _as_strings(batch, ["pricing", "added", "updated"]).to_pandas()
+            text = frame.to_json(orient="records", lines=True, force_ascii=False)
+            sink.write(text.encode("utf-8") if text.endswith("\n") else f"{text}\n".encode("utf-8"))
+
+
+def write_parquet(batches, schema, sink):
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            writer.write_table(batch)  # One row group per chunk
+
+
+WRITERS = {"CSV": write_csv, "JSONL": write_jsonl, "Parquet": write_parquet}
+
+
+def export_file(table, doc_ids, fmt, chunk_rows=CHUNK_ROWS):
+    """Write the rows at ``doc_ids`` as ``fmt`` and return the rewound file object."""
+    sink = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    WRITERS[fmt](iter_batches(table, doc_ids, chunk_rows), table.schema, sink)
+    sink.seek(0)
+    return sink
+
+
+def export_name(fmt, stem="ai-tools"):
+    return f"{stem}.{EXPORT_FORMATS[fmt][0]}"
@@ -0,0 +1,110 @@
+"""Load shedding for expensive render paths and outbound fetches.
+
+``ConcurrencyGovernor`` bounds how many holders run at once per process. A
+caller waits a short while for a slot and is *shed* when none frees up, so
+it renders something cheaper instead of queueing behind a traffic spike. It
+also allows one slot per session at a time, so a single session cannot
+occupy every slot.
+
+``HostRateLimiter`` keeps one token bucket per host. Together with the
+process-wide ``OUTBOUND`` governor it caps outbound requests. Every
+``net.LazySession`` fetch goes through both and raises ``Throttled`` when it
+cannot get through in time.
+"""
+import contextlib
+import os
+import threading
+import time
+
+MAX_HEAVY_RENDERS = int(os.environ.get("AITREND_MAX_HEAVY_RENDERS", max(2, os.cpu_count() or 1)))
+RENDER_WAIT = float(os.environ.get("AITREND_RENDER_WAIT", 0.5))  # Seconds a rerun waits for a render slot
+MAX_OUTBOUND = int(os.environ.get("AITREND_MAX_OUTBOUND", 16))
+HOST_RATE = float(os.environ.get("AITREND_HOST_RATE", 10))  # Requests per second per host
+HOST_BURST = int(os.environ.get("AITREND_HOST_BURST", 20))
+
+
+class Throttled(Exception):
+    """An outbound fetch was shed by the governor; retry later rather than treating the host as down."""
+
+
+class ConcurrencyGovernor:
+    def __init__(self, limit, wait=0.0):
+        self.limit = limit
+        self.wait = wait
+        self.active = 0
+        self.waiting = 0  # Queue depth: callers blocked on a slot right now
+        self.admitted = 0
+        self.shed = 0
+        self._sessions = set()  # Sessions holding a slot
+        self._condition = threading.Condition()
+
+    def acquire(self, session=None, wait=None):
+        """Take a slot within ``wait`` seconds (default ``self.wait``); ``False`` if shed."""
+        deadline = time.monotonic() + (self.wait if wait is None else wait)
+        with self._condition:
+            if session is not None and session in self._sessions:
+                self.shed += 1
+                return False
+            self.waiting += 1
+            try:
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            self.admitted += 1
+            if session is not None:
+                self._sessions.add(session)
+            return True
+
+    def release(self, session=None):
+        with self._condition:
+            self.active -= 1
+            self._sessions.discard(session)
+            self._condition.notify()
+
+    @contextlib.contextmanager
+    def slot(self, session=None, wait=None):
+        """Context manager yielding whether a slot was taken; it is released on exit."""
+        admitted = self.acquire(session, wait)
+        try:
+            yield admitted
+        finally:
+            if admitted:
+                self.release(session)
+
+
+class HostRateLimiter:
+    def __init__(self, rate=HOST_RATE, burst=HOST_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.throttled = 0
+        self._buckets = {}  # host -> (tokens, monotonic time of last refill)
+        self._lock = threading.Lock()
+
+    def acquire(self, host, wait=0.0):
+        """Take one token for ``host``, sleeping up to ``wait`` seconds for a refill; ``False`` if throttled."""
+        deadline = time.monotonic() + wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return True
+                self._buckets[host] = (tokens, now)
+                delay = (1 - tokens) / self.rate
+                if now + delay > deadline:
+                    self.throttled += 1
+                    return False
+            time.sleep(delay)
+
+
+# Process-wide limits on outbound HTTP, shared by every store's session.
+OUTBOUND = ConcurrencyGovernor(MAX_OUTBOUND)
+HOST_LIMITER = HostRateLimiter()
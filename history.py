@@ -0,0 +1,195 @@
+"""Metric history for tools, Hugging Face models and GitHub repos.
+
+``HistoryStore`` keeps an append-only SQLite log (``AITREND_HISTORY_DB``,
+default ``~/.cache/aitrend/history.sqlite``) of ``(kind, ref, metric,
+timestamp, value)`` samples, recorded by the refresher. A sample is only
+appended when the value differs from the series' last one, so an unchanged
+catalog costs nothing to re-record and several workers sharing the database
+do not duplicate each other's samples.
+
+Every append also updates two rollup tables in the same transaction: the last
+value per series per UTC day and per ISO week. Charts and growth rates only
+ever read the rollups (daily up to ``DAILY_MAX_DAYS``, weekly beyond), never
+the raw log, and a series' value on a day without a sample is carried forward
+from its previous one.
+"""
+import datetime
+import os
+import threading
+
+import pandas as pd
+
+from sqlite_pool import ConnectionPool
+
+DEFAULT_HISTORY_DB = os.environ.get(
+    "AITREND_HISTORY_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "aitrend", "history.sqlite"),
+)
+
+ROLLUPS = ("daily", "weekly")
+DAILY_MAX_DAYS = 90
+GROWTH_DAYS = 7  # Window of the "Fastest Growing" tool sort
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    kind TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    value REAL NOT NULL
+);
+""" + "".join(f"""
+CREATE TABLE IF NOT EXISTS {rollup} (
+    kind TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    period TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (kind, metric, ref, period)
+) WITHOUT ROWID;
+""" for rollup in ROLLUPS)
+
+ROLLUP_UPSERT = """
+INSERT INTO {rollup} (kind, metric, ref, period, ts, value) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (kind, metric, ref, period) DO UPDATE SET ts = excluded.ts, value = excluded.value
+WHERE excluded.ts >= {rollup}.ts
+"""
+
+# Latest value per series, next to its value at the start of the window (or
+# its first one, for series younger than the window).
+GROWTH_QUERY = """
+WITH latest AS (
+    SELECT ref, max(period) AS period, value FROM {rollup} WHERE kind = :kind AND metric = :metric GROUP BY ref
+), base AS (
+    SELECT ref, max(period) AS period, value FROM {rollup}
+    WHERE kind = :kind AND metric = :metric AND period <= :start GROUP BY ref
+), first AS (
+    SELECT ref, min(period) AS period, value FROM {rollup} WHERE kind = :kind AND metric = :metric GROUP BY ref
+)
+SELECT latest.ref, latest.value AS latest, coalesce(base.value, first.value) AS base
+FROM latest JOIN first USING (ref) LEFT JOIN base USING (ref)
+"""
+
+
+def utc_now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def period_of(rollup, day):
+    """Rollup period (ISO date; Monday for weeks) containing ``day``."""
+    if rollup == "weekly":
+        day -= datetime.timedelta(days=day.weekday())
+    return day.isoformat()
+
+
+def rollup_for(days):
+    return "daily" if days <= DAILY_MAX_DAYS else "weekly"
+
+
+class HistoryStore:
+    def __init__(self, path=DEFAULT_HISTORY_DB):
+        self.path = path
+        # Autocommit connections; writes use explicit transactions.
+        self._pool = ConnectionPool(path, isolation_level=None)
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._write_lock, self._pool.connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def version(self):
+        """Changes whenever a sample is appended (by any process) and at every UTC day boundary."""
+        with self._pool.connection() as connection:
+            last = connection.execute("SELECT max(rowid) FROM samples").fetchone()[0]
+        return last, utc_now().date().isoformat()
+
+    # --- Recording ---
+    def record(self, kind, samples, at=None):
+        """Append the ``(ref, metric, value)`` samples that changed and roll them up; return how many."""
+        at = at or utc_now()
+        ts = at.strftime(TIMESTAMP_FORMAT)
+        periods = {rollup: period_of(rollup, at.date()) for rollup in ROLLUPS}
+        by_metric = {}
+        for ref, metric, value in samples:
+            if value is not None:
+                by_metric.setdefault(metric, {})[ref] = float(value)
+
+        written = 0
+        with self._write_lock, self._pool.connection() as connection:
+            # IMMEDIATE takes the write lock before reading the last values, so
+            # concurrent recorders see each other's samples.
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for metric, values in by_metric.items():
+                    last = {row[0]: row[1] for row in connection.execute(
+                        "SELECT ref, value, max(period) FROM daily WHERE kind = ? AND metric = ? GROUP BY ref",
+                        (kind, metric))}
+                    changed = [(ref, value) for ref, value in values.items() if last.get(ref) != value]
+                    connection.executemany(
+                        "INSERT INTO samples (kind, ref, metric, ts, value) VALUES (?, ?, ?, ?, ?)",
+                        [(kind, ref, metric, ts, value) for ref, value in changed])
+                    for rollup, period in periods.items():
+                        connection.executemany(
+                            ROLLUP_UPSERT.format(rollup=rollup),
+                            [(kind, metric, ref, period, ts, value) for ref, value in changed])
+                    written += len(changed)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return written
+
+    def record_snapshot(self, catalog=None, trending=None, at=None):
+        """Record tool users from ``catalog`` and the live trending feeds; return samples appended."""
+        written = 0
+        if catalog is not None:
+            names = catalog.table.column("name").to_pylist()
+            users = catalog.table.column("users").to_pylist()
+            written += self.record("tool", ((name, "users", value) for name, value in zip(names, users)), at)
+        hf_feed = (trending or {}).get("hf_models")
+        if hf_feed is not None and hf_feed.live:
+            written += self.record("hf_model", [
+                (model["modelId"], metric, model[metric]) for model in hf_feed.data for metric in ("downloads", "stars")
+            ], at)
+        gh_feed = (trending or {}).get("github_trending")
+        if gh_feed is not None and gh_feed.live:
+            written += self.record("repo", [(repo["name"], "stars", repo["stars"]) for repo in gh_feed.data], at)
+        return written
+
+    # --- Queries (rollups only) ---
+    def growth(self, kind, metric, days=GROWTH_DAYS):
+        """Frame of ``ref``, ``latest``, ``base`` and relative ``growth`` over the last ``days``, fastest first."""
+        rollup = rollup_for(days)
+        start = period_of(rollup, utc_now().date() - datetime.timedelta(days=days))
+        with self._pool.connection() as connection:
+            frame = pd.read_sql_query(GROWTH_QUERY.format(rollup=rollup), connection,
+                                      params={"kind": kind, "metric": metric, "start": start})
+        frame["growth"] = (frame["latest"] - frame["base"]) / frame["base"].clip(lower=1)
+        return frame.sort_values("growth", ascending=False, kind="stable", ignore_index=True)
+
+    def series(self, kind, metric, refs, days=30):
+        """Long frame of ``period``, ``ref`` and ``value`` for ``refs`` over the last ``days``, gaps carried forward."""
+        refs = list(refs)
+        rollup = rollup_for(days)
+        today = utc_now().date()
+        start = period_of(rollup, today - datetime.timedelta(days=days))
+        placeholders = ", ".join("?" * len(refs))
+        where = f"kind = ? AND metric = ? AND ref IN ({placeholders})"
+        # The last value before the window seeds the carry-forward.
+        with self._pool.connection() as connection:
+            rows = pd.read_sql_query(
+                f"SELECT ref, period, value FROM {rollup} WHERE {where} AND period >= ? "
+                f"UNION ALL SELECT ref, max(period), value FROM {rollup} WHERE {where} AND period < ? GROUP BY ref",
+                connection, params=[kind, metric, *refs, start, kind, metric, *refs, start])
+        periods = pd.date_range(start, period_of(rollup, today), freq="D" if rollup == "daily" else "W-MON")
+        if rows.empty:
+            return pd.DataFrame({"period": pd.Series(dtype="datetime64[ns]"), "ref": [], "value": []})
+        rows["period"] = pd.to_datetime(rows["period"])
+        rows = rows.sort_values("period", kind="stable")
+        rows["period"] = rows["period"].clip(lower=periods[0])
+        wide = (rows.drop_duplicates(["ref", "period"], keep="last")
+                .pivot(index="period", columns="ref", values="value")
+                .reindex(periods).ffill())
+        wide.index.name = "period"
+        return wide.reset_index().melt(id_vars="period", var_name="ref", value_name="value").dropna()
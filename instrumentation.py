@@ -0,0 +1,226 @@
+"""Per-section render timing for dashboard reruns.
+
+Each rerun gets a ``RerunProfiler``; every dashboard section runs inside
+``profiler.section(name)``, which records wall time, outbound HTTP requests
+(``net.REQUEST_COUNTER``) and the number/bytes of Streamlit elements emitted.
+Finished reruns go to a process-wide ``MetricsStore`` that keeps a window of
+recent reruns for p50/p95 and can export to a JSONL log
+(``AITREND_METRICS_JSONL``) and a Prometheus text file
+(``AITREND_METRICS_PROM``).
+
+Fragment reruns get their own ``RerunProfiler`` with ``scope`` set to the
+fragment name; their totals are kept apart from full reruns.
+
+Network counts are process-wide, so with concurrent sessions a section may
+also see requests made on behalf of other sessions.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from net import REQUEST_COUNTER
+
+METRICS_JSONL = os.environ.get("AITREND_METRICS_JSONL")
+METRICS_PROM = os.environ.get("AITREND_METRICS_PROM")
+QUANTILES = {"p50": "0.5", "p95": "0.95"}
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+class ElementCounter:
+    """Counts delta messages Streamlit sends for the current script run.
+
+    Wraps the run context's enqueue hook; if Streamlit internals change and
+    the hook is missing, counts stay at ``None`` instead of failing the app.
+    """
+
+    def __init__(self):
+        self.elements = None
+        self.bytes = None
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+            ctx = get_script_run_ctx(suppress_warning=True)
+        except ImportError:
+            ctx = None
+        enqueue = getattr(ctx, "_enqueue", None)
+        if enqueue is None:
+            return
+        if not getattr(enqueue, "counts_elements", False):
+            # Wrap once per run context; later reruns just swap the target counter.
+            original = enqueue
+
+            def enqueue(msg):
+                counter = enqueue.counter
+                if msg.HasField("delta"):
+                    counter.elements += 1
+                    counter.bytes += msg.ByteSize()
+                original(msg)
+
+            enqueue.counts_elements = True
+            ctx._enqueue = enqueue
+        enqueue.counter = self
+        self.elements = 0
+        self.bytes = 0
+
+
+def is_fragment_rerun():
+    """True while Streamlit reruns only fragments rather than the whole script."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except ImportError:
+        return False
+    return bool(getattr(ctx, "fragment_ids_this_run", None))
+
+
+def session_id():
+    """Id of the Streamlit session running this script, or ``None`` outside one."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except ImportError:
+        return None
+    return getattr(ctx, "session_id", None)
+
+
+class RerunProfiler:
+    def __init__(self, store=None, scope="app"):
+        self.store = store
+        self.scope = scope
+        self.sections = []
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._elements = ElementCounter()
+
+    @contextmanager
+    def section(self, name):
+        started = time.perf_counter()
+        requests_before = REQUEST_COUNTER.value
+        elements_before = self._elements.elements
+        bytes_before = self._elements.bytes
+        try:
+            yield
+        finally:
+            record = {
+                "section": name,
+                "ms": round((time.perf_counter() - started) * 1000, 3),
+                "network_calls": REQUEST_COUNTER.value - requests_before,
+            }
+            if elements_before is not None:
+                record["elements"] = self._elements.elements - elements_before
+                record["bytes"] = self._elements.bytes - bytes_before
+            self.sections.append(record)
+
+    def finish(self):
+        record = {
+            "ts": self.started_at,
+            "scope": self.scope,
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "sections": self.sections,
+        }
+        if self.store is not None:
+            self.store.record(record)
+        return record
+
+
+class MetricsStore:
+    """Process-wide window of recent rerun records plus cumulative totals."""
+
+    def __init__(self, window=500, jsonl_path=METRICS_JSONL, prom_path=METRICS_PROM):
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self.reruns = deque(maxlen=window)
+        self.rerun_count = 0
+        self.rerun_seconds_sum = 0.0
+        self.gauges = {}  # name -> (help text, callable returning a number)
+        self._lock = threading.Lock()
+
+    def add_gauge(self, name, help_text, collect):
+        """Register extra metrics for the Prometheus export; ``collect()`` returns a number."""
+        self.gauges[name] = (help_text, collect)
+
+    def record(self, rerun):
+        with self._lock:
+            self.reruns.append(rerun)
+            if rerun.get("scope", "app") == "app":
+                self.rerun_count += 1
+                self.rerun_seconds_sum += rerun["total_ms"] / 1000
+        if self.jsonl_path:
+            with self._lock, open(self.jsonl_path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(rerun) + "\n")
+        if self.prom_path:
+            self.write_prometheus(self.prom_path)
+
+    def summary(self):
+        """``{section: {"p50": ms, "p95": ms, "count": n}}`` over the window.
+
+        Also has ``"total"`` for full reruns and ``"total:<fragment>"`` for
+        each fragment's own reruns.
+        """
+        with self._lock:
+            reruns = list(self.reruns)
+        samples = {"total": []}
+        for rerun in reruns:
+            scope = rerun.get("scope", "app")
+            samples.setdefault("total" if scope == "app" else f"total:{scope}", []).append(rerun["total_ms"])
+        for rerun in reruns:
+            for section in rerun["sections"]:
+                samples.setdefault(section["section"], []).append(section["ms"])
+        return {
+            name: {"p50": percentile(values, 0.5), "p95": percentile(values, 0.95), "count": len(values)}
+            for name, values in samples.items()
+        }
+
+    def prometheus_text(self):
+        summary = self.summary()
+        lines = [
+            "# HELP aitrend_rerun_seconds Wall time of a full dashboard rerun.",
+            "# TYPE aitrend_rerun_seconds summary",
+        ]
+        total = summary.get("total", {"p50": 0.0, "p95": 0.0})
+        for q, quantile in QUANTILES.items():
+            lines.append(f'aitrend_rerun_seconds{{quantile="{quantile}"}} {total[q] / 1000:.6f}')
+        lines.append(f"aitrend_rerun_seconds_sum {self.rerun_seconds_sum:.6f}")
+        lines.append(f"aitrend_rerun_seconds_count {self.rerun_count}")
+        lines += [
+            "# HELP aitrend_section_seconds Wall time per dashboard section over recent reruns.",
+            "# TYPE aitrend_section_seconds gauge",
+        ]
+        for name, stats in summary.items():
+            if name.startswith("total"):
+                continue
+            for q, quantile in QUANTILES.items():
+                lines.append(f'aitrend_section_seconds{{section="{name}",quantile="{quantile}"}} {stats[q] / 1000:.6f}')
+        lines += [
+            "# HELP aitrend_fragment_rerun_seconds Wall time of a fragment-only rerun.",
+            "# TYPE aitrend_fragment_rerun_seconds gauge",
+        ]
+        for name, stats in summary.items():
+            if not name.startswith("total:"):
+                continue
+            for q, quantile in QUANTILES.items():
+                lines.append(f'aitrend_fragment_rerun_seconds{{fragment="{name[6:]}",quantile="{quantile}"}} '
+                             f'{stats[q] / 1000:.6f}')
+        lines += [
+            "# HELP aitrend_outbound_requests_total Outbound HTTP requests made by this process.",
+            "# TYPE aitrend_outbound_requests_total counter",
+            f"aitrend_outbound_requests_total {REQUEST_COUNTER.value}",
+        ]
+        for name, (help_text, collect) in self.gauges.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {collect()}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(self.prometheus_text())
+        os.replace(tmp_path, path)
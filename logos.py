@@ -0,0 +1,351 @@
+"""Logo thumbnail pipeline for the Cards view.
+
+Logos are downloaded through a pooled ``requests.Session`` on a small thread
+pool and normalized once into a square ``THUMBNAIL_SIZE`` WebP (PNG if this
+Pillow lacks WebP), taking the largest frame of multi-size ``.ico`` files.
+Decoding and encoding run in a process pool, so they never hold the serving
+process's GIL.
+
+Thumbnails live in a content-addressed on-disk cache named by the SHA-256 of
+the downloaded bytes, next to small per-URL pointer files holding that digest,
+so a cold start neither re-downloads nor re-decodes, and identical logos
+behind different URLs are normalized once. In memory, a bounded LRU with TTL
+expiry holds the thumbnail bytes. Unreachable hosts are negatively cached for
+a while so a single dead favicon server cannot stall every rerun; a URL that
+serves an undecodable image is negatively cached on its own.
+
+A page of cards is drawn from one sprite sheet: :meth:`LogoCache.get_sprite`
+packs the page's thumbnails into a single image, inlined as one ``data:`` URI,
+and each card shows its cell via ``background-position``.
+"""
+import base64
+import contextlib
+import hashlib
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from urllib.parse import urlparse
+
+from governor import Throttled
+from net import LazySession
+
+# Logos are displayed at 40px; keep 2x for high-DPI screens.
+THUMBNAIL_SIZE = 80
+SPRITE_COLUMNS = 12
+DECODE_WORKERS = min(2, os.cpu_count() or 1)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AITREND_LOGO_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "aitrend", "logos"),
+)
+
+
+# Placeholder entry for logos that failed or are still loading.
+MISSING = (0.0, None, None)
+
+
+# --- Decoding (runs in the decode pool) ---
+# Pillow is only imported where images are touched, so the serving process
+# never loads it; decoding and sprite packing happen in the pool.
+@lru_cache(maxsize=None)
+def thumbnail_format():
+    """``(Pillow format, MIME type)`` of thumbnails: WebP, or PNG when Pillow lacks it."""
+    from PIL import features
+
+    return ("WEBP", "image/webp") if features.check("webp") else ("PNG", "image/png")
+
+
+def largest_frame(image):
+    """The biggest size of an ``.ico``/``.icns`` or the biggest frame of an animated image."""
+    sizes = image.info.get("sizes")
+    if sizes:
+        image.size = max(sizes, key=lambda size: size[0] * size[1])
+        return image
+    if getattr(image, "n_frames", 1) > 1:
+        from PIL import ImageSequence
+
+        return max((frame.copy() for frame in ImageSequence.Iterator(image)),
+                   key=lambda frame: frame.width * frame.height)
+    return image
+
+
+class LogoDecodeError(ValueError):
+    """The image could not be decoded; unlike Pillow's own errors it pickles back from the pool."""
+
+
+@contextlib.contextmanager
+def decoding():
+    from PIL import Image
+
+    try:
+        yield
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise LogoDecodeError(f"{type(exc).__name__}: {exc}") from None
+
+
+def encode(image):
+    buffer = BytesIO()
+    if thumbnail_format()[0] == "WEBP":
+        image.save(buffer, format="WEBP", quality=85, method=4)
+    else:
+        image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def normalize_logo(data, size=THUMBNAIL_SIZE):
+    """Encoded ``size``-px square thumbnail of the image in ``data``, centered on transparency."""
+    from PIL import Image
+
+    with decoding(), Image.open(BytesIO(data)) as image:
+        thumbnail = largest_frame(image).convert("RGBA")
+        thumbnail.thumbnail((size, size), Image.LANCZOS)
+    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    canvas.paste(thumbnail, ((size - thumbnail.width) // 2, (size - thumbnail.height) // 2))
+    return encode(canvas)
+
+
+def pack_sprite(thumbnails, columns, size=THUMBNAIL_SIZE):
+    """Encoded sheet with ``thumbnails`` in row-major cells of ``size`` px."""
+    from PIL import Image
+
+    rows = math.ceil(len(thumbnails) / columns)
+    sheet = Image.new("RGBA", (columns * size, rows * size), (0, 0, 0, 0))
+    for cell, data in enumerate(thumbnails):
+        with decoding(), Image.open(BytesIO(data)) as thumbnail:
+            sheet.paste(thumbnail.convert("RGBA"), ((cell % columns) * size, (cell // columns) * size))
+    return encode(sheet)
+
+
+@lru_cache(maxsize=None)
+def decode_pool():
+    """Process pool shared by every ``LogoCache``; spawned workers never inherit the app's threads."""
+    return ProcessPoolExecutor(max_workers=DECODE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_in_pool(fn, *args):
+    """``fn(*args)`` in the decode pool; a broken pool is dropped so the next call spawns a new one."""
+    pool = decode_pool()
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        decode_pool.cache_clear()
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+# --- Sprites ---
+@dataclass(frozen=True)
+class Sprite:
+    data_uri: str
+    cells: dict  # url -> cell index, row-major
+    columns: int
+    rows: int
+    key: str  # Stable id of the sheet's contents, usable as a CSS class suffix
+
+
+class LogoCache:
+    """Process-wide logo cache shared by every Streamlit session."""
+
+    def __init__(self, max_entries=512, max_sprites=64, ttl=24 * 3600, negative_ttl=15 * 60,
+                 cache_dir=DEFAULT_CACHE_DIR, max_workers=8, timeout=(3.05, 5), fetch_wait=1.0):
+        self.max_entries = max_entries
+        self.max_sprites = max_sprites
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self._entries = OrderedDict()  # url -> (expires_at, digest or None, thumbnail bytes or None)
+        self._sprites = OrderedDict()  # digests -> (data URI, columns, rows, key)
+        self._failed_hosts = {}  # host -> expires_at
+        self._inflight = {}  # url -> Future
+        self._lock = threading.Lock()
+        # Logos are cosmetic: give up quickly under load and show the placeholder.
+        self._session = LazySession(max_workers, wait=fetch_wait)
+        self._thumbnail_format = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="logo-fetch")
+        if cache_dir:
+            os.makedirs(os.path.join(cache_dir, "thumbs"), exist_ok=True)
+            os.makedirs(os.path.join(cache_dir, "urls"), exist_ok=True)
+
+    # --- Public API ---
+    def get_thumbnails(self, urls, deadline=8.0):
+        """Return ``{url: thumbnail bytes or None}`` for all ``urls``, fetching misses concurrently.
+
+        Fetches that have not finished within ``deadline`` seconds come back
+        as ``None`` for this rerun but keep running, so the next rerun picks
+        them up from the cache.
+        """
+        return {url: entry[2] for url, entry in self._lookup(urls, deadline).items()}
+
+    def get(self, url, deadline=8.0):
+        return self.get_thumbnails([url], deadline=deadline).get(url)
+
+    def get_sprite(self, urls, deadline=8.0):
+        """One ``Sprite`` holding the thumbnails of ``urls`` that are ready, or ``None`` if none are."""
+        ready = [(url, entry) for url, entry in self._lookup(urls, deadline).items() if entry[2] is not None]
+        if not ready:
+            return None
+        digests = tuple(entry[1] for _, entry in ready)
+        with self._lock:
+            sheet = self._sprites.get(digests)
+            if sheet is not None:
+                self._sprites.move_to_end(digests)
+        if sheet is None:
+            columns = min(len(ready), SPRITE_COLUMNS)
+            try:
+                data = run_in_pool(pack_sprite, [entry[2] for _, entry in ready], columns)
+                sheet = (f"data:{self._format[1]};base64," + base64.b64encode(data).decode("ascii"),
+                         columns, math.ceil(len(ready) / columns),
+                         hashlib.sha1("".join(digests).encode("ascii")).hexdigest()[:12])
+            except (LogoDecodeError, BrokenProcessPool):
+                return None  # Cards fall back to placeholders; a corrupt thumbnail or dead pool must not fail the page
+            with self._lock:
+                self._sprites[digests] = sheet
+                while len(self._sprites) > self.max_sprites:
+                    self._sprites.popitem(last=False)
+        data_uri, columns, rows, key = sheet
+        return Sprite(data_uri, {url: cell for cell, (url, _) in enumerate(ready)}, columns, rows, key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sprites.clear()
+            self._failed_hosts.clear()
+
+    # --- Internals ---
+    @property
+    def _format(self):
+        """``thumbnail_format()`` as answered by the decode pool, so Pillow stays out of this process."""
+        if self._thumbnail_format is None:
+            self._thumbnail_format = run_in_pool(thumbnail_format)
+        return self._thumbnail_format
+
+    def _lookup(self, urls, deadline):
+        results = {}
+        pending = {}
+        now = time.monotonic()
+        with self._lock:
+            for url in dict.fromkeys(u for u in urls if u):
+                entry = self._entries.get(url)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(url)
+                    results[url] = entry
+                elif self._host_failed(url, now):
+                    results[url] = MISSING
+                else:
+                    future = self._inflight.get(url)
+                    if future is None:
+                        future = self._executor.submit(self._load, url)
+                        self._inflight[url] = future
+                    pending[url] = future
+
+        if pending:
+            wait(pending.values(), timeout=deadline)
+        for url, future in pending.items():
+            results[url] = future.result() if future.done() else MISSING
+        return results
+
+    def _host_failed(self, url, now):
+        expires_at = self._failed_hosts.get(urlparse(url).netloc)
+        return expires_at is not None and expires_at > now
+
+    def _load(self, url):
+        import requests
+
+        digest = thumbnail = None
+        host_down = False
+        try:
+            digest = self._read_pointer(url)
+            thumbnail = self._read_thumbnail(digest) if digest else None
+            if thumbnail is None:
+                response = self._session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                digest = hashlib.sha256(response.content).hexdigest()
+                thumbnail = self._read_thumbnail(digest)
+                if thumbnail is None:
+                    # This thread only waits; the decode itself runs in another process.
+                    thumbnail = run_in_pool(normalize_logo, response.content)
+                    self._write_thumbnail(digest, thumbnail)
+                self._write_pointer(url, digest)
+        except (Throttled, BrokenProcessPool):
+            return MISSING  # Not the host's fault: no negative entry, retried next rerun
+        except (requests.RequestException, OSError):
+            digest = thumbnail = None
+            host_down = True
+        except LogoDecodeError:
+            digest = thumbnail = None  # Only this URL serves a bad image; the host's other logos may be fine
+        finally:
+            # Whatever happened, a later rerun must start a new fetch rather than re-raise this one.
+            with self._lock:
+                self._inflight.pop(url, None)
+        return self._store(url, digest, thumbnail, host_down)
+
+    def _store(self, url, digest, thumbnail, host_down=False):
+        """Cache the outcome for ``url``; failures are negatively cached, the whole host only if ``host_down``."""
+        now = time.monotonic()
+        with self._lock:
+            self._inflight.pop(url, None)
+            if thumbnail is None:
+                if host_down:
+                    self._failed_hosts[urlparse(url).netloc] = now + self.negative_ttl
+                entry = (now + self.negative_ttl, None, None)
+            else:
+                entry = (now + self.ttl, digest, thumbnail)
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _pointer_path(self, url):
+        return os.path.join(self.cache_dir, "urls", hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _thumbnail_path(self, digest):
+        return os.path.join(self.cache_dir, "thumbs", f"{digest}.{self._format[0].lower()}")
+
+    def _read_pointer(self, url):
+        """The digest last downloaded from ``url``, unless older than the TTL."""
+        if not self.cache_dir:
+            return None
+        path = self._pointer_path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, "rb") as fh:
+                return fh.read().decode("ascii")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _read_thumbnail(self, digest):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._thumbnail_path(digest), "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def _write_thumbnail(self, digest, thumbnail):
+        if self.cache_dir:
+            self._write_disk(self._thumbnail_path(digest), thumbnail)
+
+    def _write_pointer(self, url, digest):
+        if self.cache_dir:
+            self._write_disk(self._pointer_path(url), digest.encode("ascii"))
+
+    def _write_disk(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
@@ -0,0 +1,75 @@
+"""Shared HTTP session setup for outbound requests.
+
+``requests`` is only imported when the first session is created; stores use
+``LazySession`` so that happens on their first fetch, in a background
+thread, rather than while the first rerun renders. ``LazySession`` fetches
+also pass the process-wide outbound limits in :mod:`governor`.
+"""
+import threading
+from urllib.parse import urlparse
+
+from governor import HOST_LIMITER, OUTBOUND, Throttled
+
+USER_AGENT = "aitrend-dashboard/1.0"
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def increment(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+# Every response received by a session from make_session(), for instrumentation.
+REQUEST_COUNTER = Counter()
+
+
+def _count_response(response, *args, **kwargs):
+    REQUEST_COUNTER.increment()
+
+
+def make_session(pool_size=8):
+    """A ``requests.Session`` with a connection pool sized for ``pool_size`` worker threads."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    session.hooks["response"].append(_count_response)
+    return session
+
+
+class LazySession:
+    """``make_session(pool_size)``, created on first use.
+
+    ``get`` waits up to ``wait`` seconds for a host token and an outbound
+    slot, then raises ``Throttled``.
+    """
+
+    def __init__(self, pool_size=8, wait=30.0):
+        self.pool_size = pool_size
+        self.wait = wait
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = make_session(self.pool_size)
+        return self._session
+
+    def get(self, url, **kwargs):
+        if not HOST_LIMITER.acquire(urlparse(url).netloc, self.wait):
+            raise Throttled(f"outbound limit reached for {url}")
+        with OUTBOUND.slot(wait=self.wait) as admitted:
+            if not admitted:
+                raise Throttled(f"outbound limit reached for {url}")
+            return self.session.get(url, **kwargs)
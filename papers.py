@@ -0,0 +1,280 @@
+"""Research papers: incremental feed ingestion into a local SQLite full-text index.
+
+``PaperStore`` keeps papers in a SQLite database (``AITREND_PAPERS_DB``,
+default ``~/.cache/aitrend/papers.sqlite``) with an FTS5 index over title,
+authors and abstract. Sources are arXiv-style Atom feeds or JSON lists, read
+from local files or fetched over HTTP. ``AITREND_PAPER_FEEDS`` is a
+comma-separated list of paths/URLs; the default is the arXiv API, whose base
+URL ``AITREND_ARXIV_API`` can point at a local mock server.
+
+Ingestion is incremental: every source keeps a high-water mark (the newest
+``updated`` timestamp it has delivered) and only entries past it are written.
+Unchanged sources are not even parsed: files are skipped by mtime and size,
+URLs by ``ETag`` (``If-None-Match``).
+"""
+import datetime
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from net import LazySession
+from sqlite_pool import ConnectionPool
+
+DEFAULT_PAPERS_DB = os.environ.get(
+    "AITREND_PAPERS_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "aitrend", "papers.sqlite"),
+)
+ARXIV_API = os.environ.get("AITREND_ARXIV_API", "https://export.arxiv.org/api")
+DEFAULT_SOURCES = [source.strip() for source in os.environ.get(
+    "AITREND_PAPER_FEEDS",
+    f"{ARXIV_API}/query?search_query=cat:cs.AI+OR+cat:cs.LG&sortBy=submittedDate&sortOrder=descending&max_results=100",
+).split(",") if source.strip()]
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+ARXIV = "{http://arxiv.org/schemas/atom}"
+# Versioned arXiv ids/links collapse to one paper, so revisions update it in place.
+ARXIV_ID = re.compile(r"arxiv\.org/(?:abs|pdf)/([^?#]+?)(?:v\d+)?(?:\.pdf)?$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL DEFAULT '',
+    abstract TEXT NOT NULL DEFAULT '',
+    link TEXT NOT NULL DEFAULT '',
+    venue TEXT NOT NULL DEFAULT '',
+    published TEXT NOT NULL DEFAULT '',
+    updated TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS papers_published ON papers (published DESC, pk DESC);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, authors, abstract, content='papers', content_rowid='pk', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS papers_insert AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts (rowid, title, authors, abstract) VALUES (new.pk, new.title, new.authors, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_update AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts (papers_fts, rowid, title, authors, abstract)
+        VALUES ('delete', old.pk, old.title, old.authors, old.abstract);
+    INSERT INTO papers_fts (rowid, title, authors, abstract) VALUES (new.pk, new.title, new.authors, new.abstract);
+END;
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    high_water TEXT NOT NULL DEFAULT '',
+    etag TEXT,
+    checked_at TEXT
+);
+"""
+
+UPSERT = """
+INSERT INTO papers (id, title, authors, abstract, link, venue, published, updated)
+VALUES (:id, :title, :authors, :abstract, :link, :venue, :published, :updated)
+ON CONFLICT (id) DO UPDATE SET
+    title = excluded.title, authors = excluded.authors, abstract = excluded.abstract, link = excluded.link,
+    venue = excluded.venue, published = excluded.published, updated = excluded.updated
+WHERE excluded.updated > papers.updated
+"""
+
+# Column weights for bm25(): a title hit outranks an author hit outranks an abstract hit.
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+# --- Parsing ---
+def timestamp(value):
+    """``YYYY-MM-DDTHH:MM:SSZ`` (UTC) for an ISO/Atom date or a "Month YYYY" string; '' if unknown."""
+    value = " ".join(str(value or "").split())
+    for parse in (datetime.datetime.fromisoformat,
+                  lambda text: datetime.datetime.strptime(text, "%B %Y"),
+                  lambda text: datetime.datetime.strptime(text, "%b %Y")):
+        try:
+            moment = parse(value)
+        except ValueError:
+            continue
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(datetime.timezone.utc)
+        return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return ""
+
+
+def paper_id(raw_id, link):
+    for value in (raw_id, link):
+        match = ARXIV_ID.search(value or "")
+        if match:
+            return match.group(1)
+    return raw_id or link
+
+
+def clean(text):
+    return " ".join((text or "").split())
+
+
+def make_entry(raw_id, title, authors, abstract, link, venue, published, updated):
+    published = timestamp(published)
+    return {
+        "id": paper_id(clean(raw_id), clean(link)),
+        "title": clean(title),
+        "authors": clean(authors),
+        "abstract": clean(abstract),
+        "link": clean(link),
+        "venue": clean(venue),
+        "published": published,
+        "updated": timestamp(updated) or published,
+    }
+
+
+def atom_entries(payload):
+    """Entries of an arXiv-style Atom feed."""
+    from xml.etree import ElementTree
+
+    root = ElementTree.fromstring(payload)
+    for entry in root.iter(f"{ATOM}entry"):
+        link = next((element.get("href") for element in entry.iter(f"{ATOM}link")
+                     if element.get("rel", "alternate") == "alternate"), "")
+        category = entry.find(f"{ARXIV}primary_category")
+        yield make_entry(
+            entry.findtext(f"{ATOM}id"),
+            entry.findtext(f"{ATOM}title"),
+            ", ".join(clean(name.text) for name in entry.iter(f"{ATOM}name")),
+            entry.findtext(f"{ATOM}summary"),
+            link,
+            entry.findtext(f"{ARXIV}journal_ref") or (category.get("term") if category is not None else ""),
+            entry.findtext(f"{ATOM}published"),
+            entry.findtext(f"{ATOM}updated"),
+        )
+
+
+def json_entries(items):
+    """Entries of a JSON list (or ``{"entries": [...]}``/``{"papers": [...]}``), catalog layout included."""
+    if isinstance(items, dict):
+        items = items.get("entries") or items.get("papers") or []
+    for item in items:
+        authors = item.get("authors", "")
+        if isinstance(authors, list):
+            authors = ", ".join(author.get("name", "") if isinstance(author, dict) else author for author in authors)
+        yield make_entry(
+            item.get("id"),
+            item.get("title"),
+            authors,
+            item.get("abstract") or item.get("summary"),
+            item.get("link") or item.get("url"),
+            item.get("venue") or item.get("conference") or item.get("journal_ref"),
+            item.get("published") or item.get("date"),
+            item.get("updated"),
+        )
+
+
+def feed_entries(payload):
+    """Entries of an Atom or JSON document, told apart by its first character."""
+    if payload.lstrip()[:1] == b"<":
+        return atom_entries(payload)
+    return json_entries(json.loads(payload))
+
+
+def match_expression(query):
+    """FTS5 query requiring every word of ``query``, each as a quoted prefix term."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query.lower()))
+
+
+# --- Store ---
+class PaperStore:
+    def __init__(self, path=DEFAULT_PAPERS_DB, sources=None, timeout=(3.05, 10), session=None):
+        self.path = path
+        self.sources = list(DEFAULT_SOURCES if sources is None else sources)
+        self.timeout = timeout
+        self.errors = {}  # source -> message of its last failed ingest
+        self._session = session or LazySession(1)
+        # WAL lets reruns read while the refresher writes.
+        self._pool = ConnectionPool(path, row_factory=sqlite3.Row)
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._write_lock, self._pool.connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def __len__(self):
+        with self._pool.connection() as connection:
+            return connection.execute("SELECT count(*) FROM papers").fetchone()[0]
+
+    # --- Ingestion ---
+    def source_state(self, source):
+        """``(high_water, etag)`` of ``source``."""
+        with self._pool.connection() as connection:
+            row = connection.execute(
+                "SELECT high_water, etag FROM sources WHERE source = ?", (source,)).fetchone()
+        return (row["high_water"], row["etag"]) if row else ("", None)
+
+    def ingest(self):
+        """Ingest every configured source; return ``{source: entries written}``. Failures go to ``errors``."""
+        written = {}
+        for source in self.sources:
+            try:
+                written[source] = self.ingest_source(source)
+                self.errors.pop(source, None)
+            except Exception as exc:
+                self.errors[source] = str(exc)
+        return written
+
+    def ingest_source(self, source):
+        high_water, etag = self.source_state(source)
+        payload, etag = self._read(source, etag)
+        if payload is None:
+            return 0  # Unchanged since the last ingest
+        return self.ingest_entries(source, feed_entries(payload), etag)
+
+    def ingest_entries(self, source, entries, etag=None):
+        """Write the entries of ``source`` newer than its high-water mark and advance the mark."""
+        high_water, _ = self.source_state(source)
+        # Undated entries are offered every time; the upsert only inserts them once.
+        fresh = [entry for entry in entries if entry["title"] and (entry["updated"] > high_water or not entry["updated"])]
+        high_water = max([high_water] + [entry["updated"] for entry in fresh])
+        with self._write_lock, self._pool.connection() as connection, connection:
+            connection.executemany(UPSERT, fresh)
+            connection.execute(
+                "INSERT INTO sources (source, high_water, etag, checked_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET "
+                "high_water = excluded.high_water, etag = excluded.etag, checked_at = excluded.checked_at",
+                (source, high_water, etag, datetime.datetime.now().isoformat(timespec="seconds")),
+            )
+        return len(fresh)
+
+    def _read(self, source, etag):
+        """``(payload, etag)``, or ``(None, etag)`` when the source is unchanged."""
+        if source.startswith(("http://", "https://")):
+            headers = {"If-None-Match": etag} if etag else {}
+            response = self._session.get(source, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                return None, etag
+            response.raise_for_status()
+            return response.content, response.headers.get("ETag")
+        stat = os.stat(source)
+        stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+        if stamp == etag:
+            return None, etag
+        with open(source, "rb") as file:
+            return file.read(), stamp
+
+    # --- Queries ---
+    def search(self, query="", limit=10, offset=0):
+        """``(papers, total)``: one page of dicts, best match first (newest first without a query)."""
+        match = match_expression(query)
+        with self._pool.connection() as connection:
+            if match:
+                total = connection.execute(
+                    "SELECT count(*) FROM papers_fts WHERE papers_fts MATCH ?", (match,)).fetchone()[0]
+                rows = connection.execute(
+                    "SELECT papers.* FROM papers_fts JOIN papers ON papers.pk = papers_fts.rowid "
+                    "WHERE papers_fts MATCH ? ORDER BY bm25(papers_fts, ?, ?, ?) LIMIT ? OFFSET ?",
+                    (match, *BM25_WEIGHTS, limit, offset),
+                )
+            else:
+                total = connection.execute("SELECT count(*) FROM papers").fetchone()[0]
+                rows = connection.execute(
+                    "SELECT * FROM papers ORDER BY published DESC, pk DESC LIMIT ? OFFSET ?", (limit, offset))
+            return [dict(row) for row in rows], total
+
+    def documents(self):
+        """``(title, abstract)`` of every paper, for the semantic index."""
+        with self._pool.connection() as connection:
+            return connection.execute("SELECT title, abstract FROM papers ORDER BY pk").fetchall()
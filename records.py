@@ -0,0 +1,179 @@
+"""Memory-compact tool records.
+
+``ToolRecords`` is a struct-of-arrays view over the catalog's Arrow table:
+ratings, user counts, dates (as integer ordinals, 0 when unknown) and
+category bitmasks over a shared ``CategoryVocabulary`` (seeded with the
+sidebar's category options) live in NumPy arrays and a list of shared ints,
+while names, descriptions, links, logos and pricing tiers stay in the Arrow
+columns, memory-mapped from the snapshot. A frozen ``__slots__``
+``ToolRecord`` is only materialized for the tools being shown; its
+``category``/``added``/``updated`` properties decode back to the familiar
+values on access.
+
+Records are built once per catalog snapshot and shared read-only by every
+session in the process.
+"""
+import datetime
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pyarrow.compute as pc
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+class CategoryVocabulary:
+    def __init__(self, names=()):
+        self.names = []
+        self.bits = {}
+        for name in names:
+            self.add(name)
+        self.decode = lru_cache(maxsize=4096)(self._decode)
+
+    def add(self, name):
+        if name not in self.bits:
+            self.bits[name] = 1 << len(self.names)
+            self.names.append(sys.intern(name))
+        return self.bits[name]
+
+    def encode(self, categories):
+        mask = 0
+        for name in categories:
+            mask |= self.add(name)
+        return mask
+
+    def _decode(self, mask):
+        return tuple(name for name in self.names if mask & self.bits[name])
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getstate__(self):
+        # The decode memo is rebuilt on load (warm-start cache)
+        return {"names": self.names, "bits": self.bits}
+
+    def __setstate__(self, state):
+        self.names = [sys.intern(name) for name in state["names"]]
+        self.bits = state["bits"]
+        self.decode = lru_cache(maxsize=4096)(self._decode)
+
+
+def from_ordinal(ordinal):
+    return datetime.date.fromordinal(ordinal) if ordinal else None
+
+
+@dataclass(frozen=True, slots=True)
+class ToolRecord:
+    name: str
+    description: str
+    link: str
+    logo: str
+    pricing: str
+    rating: float
+    users: int
+    category_mask: int
+    added_ordinal: int
+    updated_ordinal: int
+    vocabulary: CategoryVocabulary
+
+    @property
+    def category(self):
+        return self.vocabulary.decode(self.category_mask)
+
+    @property
+    def added(self):
+        return from_ordinal(self.added_ordinal)
+
+    @property
+    def updated(self):
+        return from_ordinal(self.updated_ordinal)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "description": self.description,
+            "link": self.link,
+            "category": list(self.category),
+            "logo": self.logo,
+            "rating": self.rating,
+            "users": self.users,
+            "pricing": self.pricing,
+            "added": self.added,
+            "updated": self.updated,
+        }
+
+
+STRING_COLUMNS = ("name", "description", "link", "logo", "pricing")
+
+
+class ToolRecords:
+    """Read-only sequence of ``ToolRecord`` backed by the catalog table's columns."""
+
+    def __init__(self, table, vocabulary):
+        self.vocabulary = vocabulary
+        self.ratings = table.column("rating").fill_null(0.0).to_numpy()
+        self.users = table.column("users").fill_null(0).to_numpy()
+        self.added_ordinals, self.updated_ordinals = (
+            pc.fill_null(table.column(name).cast("int32"), -EPOCH_ORDINAL).to_numpy() + EPOCH_ORDINAL
+            for name in ("added", "updated"))
+        # Few distinct combinations exist, so equal masks share one int object.
+        masks = {}
+        self.category_masks = [masks.setdefault(mask, mask) for mask in
+                               (vocabulary.encode(category or ()) for category in table.column("category").to_pylist())]
+        self.attach(table)
+
+    def attach(self, table):
+        """Point the string columns at ``table`` (after loading from the warm-start cache)."""
+        self._columns = {name: table.column(name) for name in STRING_COLUMNS}
+
+    def __getstate__(self):
+        # Strings stay in the snapshot; the warm-start cache only keeps the arrays.
+        state = dict(self.__dict__)
+        del state["_columns"]
+        return state
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def column(self, name):
+        """The Arrow column ``name`` (one of ``STRING_COLUMNS``)."""
+        return self._columns[name]
+
+    def categories(self, doc_id):
+        return self.vocabulary.decode(self.category_masks[doc_id])
+
+    def __getitem__(self, doc_id):
+        return self.take([doc_id])[0]
+
+    def take(self, doc_ids):
+        """``ToolRecord`` for each of ``doc_ids``, reading one slice per column."""
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        strings = [[_intern(value) for value in self._columns[name].take(doc_ids).to_pylist()]
+                   for name in STRING_COLUMNS]
+        return [
+            ToolRecord(
+                name=name,
+                description=description,
+                link=link,
+                logo=logo,
+                pricing=pricing,
+                rating=float(self.ratings[doc_id]),
+                users=int(self.users[doc_id]),
+                category_mask=self.category_masks[doc_id],
+                added_ordinal=int(self.added_ordinals[doc_id]),
+                updated_ordinal=int(self.updated_ordinals[doc_id]),
+                vocabulary=self.vocabulary,
+            )
+            for doc_id, name, description, link, logo, pricing in zip(doc_ids, *strings)
+        ]
+
+
+def _intern(value):
+    return sys.intern(value) if value else (value or "")
+
+
+def records_from_table(table, vocabulary):
+    """Build the ``ToolRecords`` view of a catalog Arrow table."""
+    return ToolRecords(table, vocabulary)
@@ -0,0 +1,174 @@
+"""Background data refresh, decoupled from Streamlit reruns.
+
+A single ``RefreshScheduler`` thread per process periodically rebuilds the
+dashboard data (catalog, search index/query engine, trending feeds, the
+papers index and the metric history) into a new immutable ``Snapshot`` and publishes it by swapping one
+reference. Reruns only ever read ``scheduler.current()``, so they never wait
+on I/O. The first snapshot is built synchronously (with the bundled trending
+samples) so there is always one; the thread's first pass then fetches live
+data immediately.
+"""
+import datetime
+import os
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+
+from catalog import load_catalog, source_stamp
+from engine import ToolQueryEngine
+from history import GROWTH_DAYS, HistoryStore
+from papers import PaperStore, json_entries
+from search import SearchIndex
+from trending import TrendingStore
+
+DEFAULT_INTERVAL = float(os.environ.get("AITREND_REFRESH_INTERVAL", 15 * 60))
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    catalog: object
+    engine: object
+    trending: dict  # feed name -> FeedState copy
+    papers: object  # PaperStore; only the refresher thread writes to it
+    history: object  # HistoryStore, likewise
+    built_at: datetime.datetime
+    build_seconds: float
+    source_stamp: tuple = None
+    errors: tuple = field(default=())
+
+    @property
+    def version(self):
+        return self.catalog.version
+
+
+class SnapshotBuilder:
+    """Builds snapshots, reusing the previous catalog/engine when the source is unchanged."""
+
+    def __init__(self, catalog_path, category_options, trending_store=None, paper_store=None, history=None,
+                 warm_start=None):
+        self.catalog_path = catalog_path
+        self.category_options = list(category_options)
+        self.trending_store = trending_store
+        self.paper_store = paper_store
+        self.history = history
+        self.warm_start = warm_start
+
+    def build_engine(self, catalog):
+        """Query engine for ``catalog``, reusing warm-started records and search index when they match."""
+        warm = self.warm_start.take("search_index", self.warm_version(catalog)) if self.warm_start else None
+        if warm is not None:
+            catalog.tools, index = warm
+        else:
+            index = SearchIndex(catalog.tools, self.category_options)
+        return ToolQueryEngine(catalog.table, index)
+
+    def warm_version(self, catalog):
+        return catalog.version, tuple(self.category_options)
+
+    def warm_state(self, snapshot):
+        """``(version, value)`` for the warm-start cache: the records and search index of ``snapshot``."""
+        return self.warm_version(snapshot.catalog), (snapshot.catalog.tools, snapshot.engine.index)
+
+    def __call__(self, previous=None):
+        started = time.perf_counter()
+        errors = []
+        stamp = source_stamp(self.catalog_path)
+        if previous is not None and previous.source_stamp == stamp:
+            catalog, engine = previous.catalog, previous.engine
+        else:
+            catalog = load_catalog(self.catalog_path)
+            if previous is not None and previous.catalog.version == catalog.version:
+                # Touched but identical content: keep the already built engine.
+                catalog, engine = previous.catalog, previous.engine
+            else:
+                engine = self.build_engine(catalog)
+
+        if self.trending_store is None:
+            self.trending_store = TrendingStore(
+                seed={"hf_models": catalog.hf_models, "github_trending": catalog.github_trending})
+        if previous is not None:
+            # The initial snapshot uses the seeded samples; the refresher
+            # thread's first pass fetches live data right after startup.
+            self.trending_store.refresh(wait=True, force=True)
+        trending = self.trending_store.snapshot()
+        errors.extend(f"{name}: {state.error}" for name, state in trending.items() if state.error)
+
+        catalog_changed = previous is None or previous.catalog is not catalog
+        if self.paper_store is None:
+            self.paper_store = PaperStore()
+        if catalog_changed:
+            # The catalog's bundled papers are one more source, behind its own high-water mark.
+            self.paper_store.ingest_entries("catalog", json_entries(catalog.papers))
+        if previous is not None:
+            self.paper_store.ingest()
+        errors.extend(f"papers {source}: {error}" for source, error in self.paper_store.errors.items())
+
+        if self.history is None:
+            self.history = HistoryStore()
+        # Unchanged values are not appended, so only a new catalog is worth re-reading.
+        self.history.record_snapshot(catalog if catalog_changed else None, trending)
+        growth_version = (catalog.version, self.history.version()[1])
+        if engine.growth_version != growth_version:
+            # Tool samples only change with the catalog, rates also move with the window.
+            growth = self.history.growth("tool", "users", GROWTH_DAYS).set_index("ref")["growth"]
+            names = catalog.table.column("name").to_pandas()
+            engine = engine.with_growth(names.map(growth).to_numpy(), growth_version)
+
+        return Snapshot(
+            catalog=catalog,
+            engine=engine,
+            trending=trending,
+            papers=self.paper_store,
+            history=self.history,
+            built_at=datetime.datetime.now(),
+            build_seconds=time.perf_counter() - started,
+            source_stamp=stamp,
+            errors=tuple(errors),
+        )
+
+
+class RefreshScheduler:
+    def __init__(self, build, interval=DEFAULT_INTERVAL):
+        self.build = build
+        self.interval = interval
+        self.refreshing = False
+        self.last_error = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._snapshot = build(None)
+        self._thread = threading.Thread(target=self._run, name="aitrend-refresher", daemon=True)
+
+    def start(self):
+        if not self._thread.is_alive():
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def current(self):
+        return self._snapshot
+
+    def trigger(self):
+        """Request an immediate out-of-band refresh."""
+        self._wake.set()
+
+    def refresh_now(self):
+        self.refreshing = True
+        try:
+            snapshot = self.build(self._snapshot)
+            # Publishing is a single reference assignment, atomic for readers.
+            self._snapshot = snapshot
+            self.last_error = None
+        except Exception:
+            self.last_error = traceback.format_exc(limit=3)
+        finally:
+            self.refreshing = False
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_now()
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,152 @@
+"""Prebuilt search index for the tools sidebar filters.
+
+The index is built once per catalog version. Text search goes through a token
+inverted index: each query term is matched against the (much smaller) token
+vocabulary by prefix/substring, the matching postings are OR-ed into a boolean
+document mask, and the term masks are AND-ed together. Only the surviving
+candidates are checked against the full query string, which keeps the
+original "substring of name or description" semantics; the check reads the
+candidates' descriptions straight from the catalog's Arrow column rather
+than a lowercased copy of every description.
+Category and rating filters are plain boolean array intersections.
+"""
+import re
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+import pyarrow.compute as pc
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Rank weights: where the query matched decides the order of ranked results.
+NAME_PREFIX_SCORE = 4.0
+NAME_SCORE = 3.0
+CATEGORY_SCORE = 2.0
+DESCRIPTION_SCORE = 1.0
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    def __init__(self, tools, category_options=()):
+        self.size = len(tools)
+        self._tools = tools  # Shared with the catalog, not copied
+        self._names = [name.lower() for name in tools.column("name").to_pylist()]
+        # One lowercased string per distinct category combination.
+        category_text = {}
+        self._categories = [category_text.setdefault(mask, " ".join(tools.vocabulary.decode(mask)).lower())
+                            for mask in tools.category_masks]
+        postings = {}
+        for doc_id, description in enumerate(tools.column("description").to_pylist()):
+            tokens = set(tokenize(self._names[doc_id]))
+            tokens.update(tokenize(description or ""))
+            tokens.update(tokenize(self._categories[doc_id]))
+            for token in tokens:
+                postings.setdefault(token, []).append(doc_id)
+
+        self._vocab = sorted(postings)
+        self._postings = [np.asarray(postings[token], dtype=np.int32) for token in self._vocab]
+        self.ratings = tools.ratings
+
+        # One bitmap per category, with the sidebar options first so their order is stable.
+        self.category_masks = {}
+        for category in list(category_options) + list(tools.vocabulary.names):
+            self.category_masks.setdefault(category, np.zeros(self.size, dtype=bool))
+        for doc_id, mask in enumerate(tools.category_masks):
+            for category in tools.vocabulary.decode(mask):
+                self.category_masks[category][doc_id] = True
+
+        self._term_mask = lru_cache(maxsize=1024)(self._term_mask_uncached)
+
+    def __getstate__(self):
+        # The term mask memo is rebuilt on load (warm-start cache)
+        state = dict(self.__dict__)
+        del state["_term_mask"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._term_mask = lru_cache(maxsize=1024)(self._term_mask_uncached)
+
+    # --- Masks ---
+    def _term_mask_uncached(self, term):
+        """Documents containing a token that has ``term`` as a substring."""
+        # Prefix matches are a contiguous run of the sorted vocabulary.
+        start = bisect_left(self._vocab, term)
+        end = start
+        while end < len(self._vocab) and self._vocab[end].startswith(term):
+            end += 1
+        matched = list(range(start, end))
+        matched += [i for i, token in enumerate(self._vocab)
+                    if (i < start or i >= end) and term in token]
+        mask = np.zeros(self.size, dtype=bool)
+        if matched:
+            mask[np.concatenate([self._postings[i] for i in matched])] = True
+        mask.flags.writeable = False
+        return mask
+
+    def text_mask(self, query):
+        query = query.lower()
+        mask = np.ones(self.size, dtype=bool)
+        if not query:
+            return mask
+        terms = tokenize(query)
+        for term in set(terms):
+            mask &= self._term_mask(term)
+        if terms == [query]:
+            return mask  # A purely alphanumeric query can only match inside one token: already exact
+        # Verify candidates against the whole query so punctuation and
+        # cross-token spans behave exactly like a plain substring search.
+        candidates = np.flatnonzero(mask)
+        mask[candidates] = self._contains(candidates, query)
+        return mask
+
+    def _contains(self, doc_ids, query):
+        """Whether lowercase ``query`` is a substring of each tool's name, description or categories."""
+        descriptions = pc.utf8_lower(self._tools.column("description").take(doc_ids))
+        found = pc.fill_null(pc.match_substring(descriptions, query), False).to_numpy()
+        for pos, doc_id in enumerate(doc_ids):
+            found[pos] = found[pos] or query in self._names[doc_id] or query in self._categories[doc_id]
+        return found
+
+    def category_mask(self, categories):
+        if not categories:
+            return np.ones(self.size, dtype=bool)
+        mask = np.zeros(self.size, dtype=bool)
+        for category in categories:
+            if category in self.category_masks:
+                mask |= self.category_masks[category]
+        return mask
+
+    def rating_mask(self, min_rating):
+        return self.ratings >= min_rating
+
+    # --- Queries ---
+    def scores(self, query, doc_ids):
+        """Relevance score per document id, higher is better."""
+        query = query.lower()
+        scores = np.empty(len(doc_ids), dtype=np.float64)
+        for pos, doc_id in enumerate(doc_ids):
+            name = self._names[doc_id]
+            if name.startswith(query):
+                scores[pos] = NAME_PREFIX_SCORE
+            elif query in name:
+                scores[pos] = NAME_SCORE
+            elif query in self._categories[doc_id]:
+                scores[pos] = CATEGORY_SCORE
+            else:
+                scores[pos] = DESCRIPTION_SCORE
+        return scores
+
+    def filter(self, query, categories=(), min_rating=0.0):
+        """Matching document ids, ranked by relevance when ``query`` is set."""
+        query = query.strip()
+        mask = self.text_mask(query) & self.category_mask(categories) & self.rating_mask(min_rating)
+        doc_ids = np.flatnonzero(mask)
+        if query and len(doc_ids):
+            # Stable sort keeps catalog order among equally relevant matches.
+            doc_ids = doc_ids[np.argsort(-self.scores(query, doc_ids), kind="stable")]
+        return doc_ids
@@ -0,0 +1,361 @@
+"""Offline semantic search over tools, trending repos and papers.
+
+Documents are embedded into unit vectors and searched by cosine similarity.
+The default embedder is TF-IDF followed by a truncated SVD (latent semantic
+analysis), fitted in plain NumPy on the catalog itself, so it needs no GPU,
+no network and no extra packages. If ``AITREND_EMBED_MODEL`` names a
+sentence-transformers model and that package is installed, it is used on CPU
+instead.
+
+The ``VectorIndex`` persists its vectors as a ``.npy`` file that is
+memory-mapped on load, together with the fitted model and one content hash
+per document. Each save writes a complete new generation directory and then
+repoints ``CURRENT`` at it, so processes sharing the directory never load a
+mix of files from different saves. Syncing a new document set reuses the stored vector of every
+unchanged document and only embeds new or edited ones; the model is refitted
+from scratch when most documents changed. Search is a batched matrix product
+over the mapped vectors with a running top-k per query.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_INDEX_DIR = os.environ.get(
+    "AITREND_VECTOR_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "aitrend", "vectors"),
+)
+EMBED_MODEL = os.environ.get("AITREND_EMBED_MODEL")
+
+DIMENSIONS = 128
+MAX_FEATURES = 8192
+FIT_SAMPLE = 2000  # Documents the SVD is fitted on; the rest are only projected
+REFIT_FRACTION = 0.5
+BATCH_ROWS = 65536
+EMBED_BATCH = 1024
+
+TERM_RE = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in into is it its of on or that the this to with "
+    "all any can using use via your you".split()
+)
+SUFFIXES = ("ings", "ing", "ers", "er", "ies", "ed", "s")
+
+
+def stem(term):
+    """Crude suffix stripping so "websites"/"website" and "builders"/"build" meet."""
+    for suffix in SUFFIXES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3 and not term.endswith("ss"):
+            return term[:-len(suffix)] + ("y" if suffix == "ies" else "")
+    return term
+
+
+@lru_cache(maxsize=65536)
+def word_features(word):
+    """A word's stem plus its boundary-marked character 4-grams ("website" also matches "site")."""
+    if word in STOP_WORDS:
+        return ()
+    padded = f"<{word}>"
+    return (stem(word),) + tuple("~" + padded[i:i + 4] for i in range(len(padded) - 3) if len(word) > 3)
+
+
+def terms(text):
+    return [feature for word in TERM_RE.findall(text.lower()) for feature in word_features(word)]
+
+
+def content_key(kind, text):
+    return hashlib.sha1(f"{kind}\0{text}".encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def randomized_svd_components(matrix, rank, seed=0, oversample=10, power_iterations=2):
+    """Top-``rank`` right singular vectors of ``matrix`` as columns (Halko et al. range finder)."""
+    rank = min(rank, *matrix.shape)
+    rng = np.random.default_rng(seed)
+    basis = matrix @ rng.standard_normal((matrix.shape[1], min(rank + oversample, matrix.shape[0])),
+                                         dtype=np.float32)
+    for _ in range(power_iterations):
+        basis, _ = np.linalg.qr(basis)
+        basis = matrix @ (matrix.T @ basis)
+    basis, _ = np.linalg.qr(basis)
+    _, _, vt = np.linalg.svd(basis.T @ matrix, full_matrices=False)
+    return np.ascontiguousarray(vt[:rank].T, dtype=np.float32)
+
+
+# --- Embedders ---
+class TfidfSvdEmbedder:
+    name = "tfidf-svd"
+
+    def __init__(self, vocabulary, idf, components):
+        self.vocabulary = vocabulary  # term -> column
+        self.idf = idf
+        self.components = components  # (terms, dimensions)
+
+    @property
+    def dimensions(self):
+        return self.components.shape[1]
+
+    @classmethod
+    def fit(cls, texts, dimensions=DIMENSIONS, max_features=MAX_FEATURES, sample=FIT_SAMPLE, seed=0):
+        document_frequency = Counter()
+        for text in texts:
+            document_frequency.update(set(terms(text)))
+        # Terms seen once carry no co-occurrence signal, except in tiny catalogs.
+        min_df = 2 if len(texts) >= 1000 else 1
+        vocabulary = [term for term, df in document_frequency.most_common(max_features) if df >= min_df]
+        vocabulary = {term: column for column, term in enumerate(vocabulary)}
+        n = max(len(texts), 1)
+        idf = np.array([math.log((1 + n) / (1 + document_frequency[term])) + 1 for term in vocabulary],
+                       dtype=np.float32)
+
+        rows = np.random.default_rng(seed).permutation(len(texts))[:sample]
+        matrix = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+        for position, row in enumerate(rows):
+            for term, count in Counter(terms(texts[row])).items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    matrix[position, column] = (1 + math.log(count)) * idf[column]
+        components = randomized_svd_components(normalize_rows(matrix), dimensions, seed)
+        return cls(vocabulary, idf, components)
+
+    def embed(self, texts):
+        texts = list(texts)
+        if len(texts) > EMBED_BATCH:
+            return np.concatenate([self.embed(texts[start:start + EMBED_BATCH])
+                                   for start in range(0, len(texts), EMBED_BATCH)])
+        vocabulary = self.vocabulary
+        rows, columns = [], []
+        for row, text in enumerate(texts):
+            matched = [column for column in map(vocabulary.get, terms(text)) if column is not None]
+            rows += [row] * len(matched)
+            columns += matched
+        weighted = np.zeros((len(texts), len(self.idf)), dtype=np.float32)
+        if columns:
+            pairs, counts = np.unique(np.asarray(rows, dtype=np.int64) * len(self.idf) + columns,
+                                      return_counts=True)
+            pair_rows, pair_columns = np.divmod(pairs, len(self.idf))
+            weighted[pair_rows, pair_columns] = (1 + np.log(counts, dtype=np.float32)) * self.idf[pair_columns]
+        # A dense (batch, terms) block keeps the projection a single BLAS call.
+        vectors = weighted @ self.components
+        return normalize_rows(vectors)
+
+    def save(self, path):
+        terms_by_column = sorted(self.vocabulary, key=self.vocabulary.get)
+        np.savez(path, terms=np.array(terms_by_column, dtype=str), idf=self.idf, components=self.components)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            vocabulary = {term: column for column, term in enumerate(data["terms"].tolist())}
+            return cls(vocabulary, data["idf"], data["components"])
+
+
+class SentenceTransformerEmbedder:
+    """Pretrained local model; nothing to fit or persist besides its name."""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = f"st:{model_name}"
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    @property
+    def dimensions(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts):
+        return self.model.encode(list(texts), batch_size=64, normalize_embeddings=True,
+                                 convert_to_numpy=True).astype(np.float32)
+
+
+def local_model():
+    """The configured sentence-transformers embedder, or ``None`` to use TF-IDF/SVD."""
+    if not EMBED_MODEL:
+        return None
+    try:
+        return SentenceTransformerEmbedder(EMBED_MODEL)
+    except ImportError:
+        return None
+
+
+# --- Documents ---
+def snapshot_documents(snapshot):
+    """``(kind, ref, text)`` for every tool (ref = tool id, in catalog order), repo and paper."""
+    tools = snapshot.catalog.tools
+    documents = [("tool", doc_id, f"{name}. {description or ''} {' '.join(tools.categories(doc_id))}")
+                 for doc_id, (name, description) in enumerate(zip(tools.column("name").to_pylist(),
+                                                                  tools.column("description").to_pylist()))]
+    documents += [("repo", repo["name"], f"{repo['name'].replace('/', ' ')}. {repo.get('description', '')}")
+                  for repo in snapshot.trending["github_trending"].data]
+    documents += [("paper", title, f"{title}. {abstract}") for title, abstract in snapshot.papers.documents()]
+    return documents
+
+
+# --- Index ---
+class VectorIndex:
+    def __init__(self, directory=DEFAULT_INDEX_DIR, embedder=None):
+        self.directory = directory
+        self.embedder = embedder
+        self.version = None
+        self.keys = []
+        self.kinds = np.empty(0, dtype="<U5")
+        self.refs = []
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+        if directory:
+            self._load()
+
+    def __len__(self):
+        return len(self.keys)
+
+    # --- Persistence ---
+    def _current(self):
+        """Directory of the saved index generation that ``CURRENT`` points at."""
+        with open(os.path.join(self.directory, "CURRENT"), encoding="utf-8") as fh:
+            return os.path.join(self.directory, fh.read().strip())
+
+    def _load(self):
+        try:
+            current = self._current()
+            with open(os.path.join(current, "meta.json"), encoding="utf-8") as fh:
+                meta = json.load(fh)
+            vectors = np.load(os.path.join(current, "vectors.npy"), mmap_mode="r")
+            if meta["embedder"] == TfidfSvdEmbedder.name:
+                embedder = TfidfSvdEmbedder.load(os.path.join(current, "model.npz"))
+            else:
+                embedder = self.embedder or local_model()
+                if embedder is None or embedder.name != meta["embedder"]:
+                    return
+        except (OSError, ValueError, KeyError):
+            return  # No usable index yet; the first sync builds one.
+        if vectors.shape[0] != len(meta["keys"]):
+            return
+        self.embedder = embedder
+        self.keys = meta["keys"]
+        self.kinds = np.array(meta["kinds"], dtype="<U5")
+        self.refs = meta["refs"]
+        self.vectors = vectors
+
+    def _save(self):
+        """Write a complete new generation, then switch ``CURRENT`` to it in one rename.
+
+        Several processes may share ``directory``: readers only ever follow
+        ``CURRENT`` to a generation that is fully written, never a mix of files
+        from different saves.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"index-{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+        generation = os.path.join(self.directory, name)
+        staging = generation + ".tmp"
+        os.makedirs(staging)
+        if isinstance(self.embedder, TfidfSvdEmbedder):
+            self.embedder.save(os.path.join(staging, "model.npz"))
+        np.save(os.path.join(staging, "vectors.npy"), np.asarray(self.vectors))
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump({"embedder": self.embedder.name, "keys": self.keys, "kinds": self.kinds.tolist(),
+                       "refs": self.refs}, fh)
+        os.rename(staging, generation)
+        pointer = os.path.join(self.directory, f"CURRENT.{name}.tmp")
+        with open(pointer, "w", encoding="utf-8") as fh:
+            fh.write(name)
+        os.replace(pointer, os.path.join(self.directory, "CURRENT"))
+        self.vectors = np.load(os.path.join(generation, "vectors.npy"), mmap_mode="r")
+        # Older generations can go; processes still mapping one keep its pages alive.
+        for entry in os.listdir(self.directory):
+            if entry.startswith("index-") and not entry.endswith(".tmp") and entry != name:
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+    # --- Building ---
+    def sync(self, documents, version=None):
+        """Make the index cover ``documents``; returns ``{"reused", "embedded", "refit"}``.
+
+        ``version`` is an optional fingerprint of ``documents``: syncing the
+        same version again is a no-op. ``documents`` may be a zero-argument
+        callable, which is then only called when the version changed.
+        """
+        with self._lock:
+            if version is not None and version == self.version:
+                return {"reused": len(self.keys), "embedded": 0, "refit": False}
+            if callable(documents):
+                documents = documents()
+            texts = [text for _, _, text in documents]
+            keys = [content_key(kind, text) for kind, _, text in documents]
+            old_rows = {key: row for row, key in enumerate(self.keys)}
+            missing = [i for i, key in enumerate(keys) if key not in old_rows]
+
+            refit = self.embedder is None or (
+                isinstance(self.embedder, TfidfSvdEmbedder) and len(missing) > REFIT_FRACTION * len(keys))
+            if refit:
+                self.embedder = local_model() or TfidfSvdEmbedder.fit(texts)
+                missing = list(range(len(keys)))
+            vectors = np.empty((len(keys), self.embedder.dimensions), dtype=np.float32)
+            if not refit and keys:
+                present = [i for i, key in enumerate(keys) if key in old_rows]
+                vectors[present] = self.vectors[[old_rows[keys[i]] for i in present]]
+            if missing:
+                vectors[missing] = self.embedder.embed([texts[i] for i in missing])
+
+            changed = refit or bool(missing) or keys != self.keys
+            self.keys = keys
+            self.kinds = np.array([kind for kind, _, _ in documents], dtype="<U5")
+            self.refs = [ref for _, ref, _ in documents]
+            self.vectors = vectors
+            if changed and self.directory:
+                self._save()
+            self.version = version
+            return {"reused": len(keys) - len(missing), "embedded": len(missing), "refit": refit}
+
+    # --- Search ---
+    def search(self, queries, k=10, mask=None, kinds=None):
+        """Top-``k`` ``(rows, scores, refs, kinds)`` per query, best first.
+
+        ``mask`` covers the leading rows (rows past its end are not eligible)
+        and ``kinds`` limits matches to those document kinds. Everything is
+        read from one consistent state, even while another thread syncs.
+        """
+        with self._lock:
+            embedder, stored, stored_kinds, stored_refs = self.embedder, self.vectors, self.kinds, self.refs
+        if not len(stored) or not queries:
+            return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32), [], np.empty(0, dtype="<U5"))
+                    for _ in queries]
+        if mask is not None:
+            eligible = np.zeros(len(stored), dtype=bool)
+            eligible[:len(mask)] = mask[:len(stored)]
+            mask = eligible
+        if kinds is not None:
+            mask = np.isin(stored_kinds, kinds) if mask is None else mask & np.isin(stored_kinds, kinds)
+        query_vectors = embedder.embed(list(queries))
+        best_rows = np.empty((0, len(queries)), dtype=np.int64)
+        best_scores = np.empty((0, len(queries)), dtype=np.float32)
+        for start in range(0, len(stored), BATCH_ROWS):
+            scores = np.asarray(stored[start:start + BATCH_ROWS]) @ query_vectors.T
+            if mask is not None:
+                scores[~mask[start:start + BATCH_ROWS]] = -np.inf
+            take = min(k, len(scores))
+            top = np.argpartition(-scores, take - 1, axis=0)[:take]
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=0)])
+            if len(best_rows) > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=0)[:k]
+                best_rows = np.take_along_axis(best_rows, keep, axis=0)
+                best_scores = np.take_along_axis(best_scores, keep, axis=0)
+        results = []
+        for column in range(len(queries)):
+            order = np.argsort(-best_scores[:, column], kind="stable")
+            rows, scores = best_rows[order, column], best_scores[order, column]
+            finite = np.isfinite(scores)
+            rows, scores = rows[finite], scores[finite]
+            results.append((rows, scores, [stored_refs[row] for row in rows], stored_kinds[rows]))
+        return results
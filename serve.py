@@ -0,0 +1,304 @@
+"""Multi-process deployment: N Streamlit workers behind a local TCP load balancer.
+
+Run from the repository root::
+
+    python serve.py --workers 4 --port 8501
+
+The supervisor compiles the catalog once into an Arrow snapshot under a
+shared-memory directory (``/dev/shm/aitrend`` by default, ``AITREND_SHM_DIR``)
+and starts every worker with ``AITREND_SNAPSHOT_DIR`` pointing there. Workers
+find the snapshot by content hash and memory-map it, so they all share the
+same physical pages instead of each parsing its own copy. What is derived
+from it (tool records, search index, the engine's pandas frame, the semantic
+index) is still built per process.
+
+Every worker slot has its own state directory under ``--state-dir``
+(``AITREND_SERVE_STATE_DIR``) for the vector index, papers and history
+databases and the warm-start cache, so workers never overwrite each other's
+files. A replacement worker reuses its slot's directory and so boots warm.
+The logo cache is content-addressed with atomic writes and stays shared.
+
+The supervisor polls the catalog source. When its content changes it
+publishes the new snapshot and replaces the workers one at a time: each
+replacement must pass Streamlit's health check before it takes traffic, then
+the old worker is stopped (its browser sessions reconnect through the
+balancer). Workers that exit on their own are restarted the same way.
+
+The balancer is a plain TCP proxy. By default it pins each client address to
+one worker, because a Streamlit session's websocket and its media/download
+requests must reach the same process; ``--balance leastconn`` spreads
+connections instead, which suits load tests from a single host.
+"""
+import argparse
+import asyncio
+import glob
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import zlib
+
+from catalog import DEFAULT_CATALOG_PATH, load_catalog, source_stamp
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "aitrend.py")
+DEFAULT_SHM_DIR = os.environ.get(
+    "AITREND_SHM_DIR",
+    "/dev/shm/aitrend" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "aitrend-shm"),
+)
+DEFAULT_STATE_DIR = os.environ.get(
+    "AITREND_SERVE_STATE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "aitrend", "workers"),
+)
+
+log = logging.getLogger("aitrend.serve")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prune_snapshots(snapshot_dir, keep):
+    """Unlink snapshot files other than ``keep``; workers still mapping one keep it alive."""
+    for path in glob.glob(os.path.join(snapshot_dir, "*.arrow")):
+        if path not in keep:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+# --- Workers ---
+class Worker:
+    def __init__(self, slot, port, env):
+        self.slot = slot
+        self.port = port
+        self.connections = 0
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP_PATH,
+             "--server.port", str(port), "--server.address", "127.0.0.1",
+             "--server.headless", "true", "--browser.gatherUsageStats", "false"],
+            env=env,
+        )
+
+    def __repr__(self):
+        return f"Worker(slot={self.slot}, pid={self.process.pid}, port={self.port})"
+
+    @property
+    def alive(self):
+        return self.process.poll() is None
+
+    def healthy(self):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def wait_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self.alive:
+            if self.healthy():
+                return True
+            time.sleep(0.2)
+        return False
+
+    def stop(self, timeout=10):
+        if self.alive:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+# --- Load balancer ---
+async def pipe(reader, writer):
+    try:
+        while data := await reader.read(1 << 16):
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+class Balancer:
+    def __init__(self, mode="source"):
+        self.mode = mode
+        self.workers = []  # Replaced as a whole by the supervisor, never mutated in place
+
+    def pick(self, client):
+        workers = self.workers
+        if not workers:
+            return None
+        if self.mode == "leastconn":
+            return min(workers, key=lambda worker: worker.connections)
+        return workers[zlib.crc32(client.encode()) % len(workers)]
+
+    async def handle(self, reader, writer):
+        client = (writer.get_extra_info("peername") or ("",))[0]
+        worker = self.pick(client)
+        if worker is None:
+            log.warning("dropping connection from %s: no workers available", client)
+            writer.close()
+            return
+        worker.connections += 1  # Counted before connecting, so simultaneous accepts spread out
+        try:
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", worker.port)
+            except OSError as exc:
+                log.warning("dropping connection from %s: %s", client, exc)
+                writer.close()
+                return
+            await asyncio.gather(pipe(reader, upstream_writer), pipe(upstream_reader, writer))
+        finally:
+            worker.connections -= 1
+
+    async def serve(self, host, port, stop):
+        server = await asyncio.start_server(self.handle, host, port)
+        log.info("balancing on http://%s:%d (%s)", host, port, self.mode)
+        async with server:
+            await stop.wait()
+
+
+# --- Supervisor ---
+class Supervisor:
+    def __init__(self, catalog_path=DEFAULT_CATALOG_PATH, workers=os.cpu_count() or 1, shm_dir=DEFAULT_SHM_DIR,
+                 balance="source", poll_interval=5.0, ready_timeout=60.0, drain_seconds=5.0,
+                 state_dir=DEFAULT_STATE_DIR):
+        self.catalog_path = os.path.abspath(catalog_path)
+        self.worker_count = workers
+        self.shm_dir = shm_dir
+        self.state_dir = os.path.abspath(state_dir)
+        self.poll_interval = poll_interval
+        self.ready_timeout = ready_timeout
+        self.drain_seconds = drain_seconds
+        self.balancer = Balancer(balance)
+        self.version = None
+        self.snapshot_paths = []
+        self._stamp = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def publish(self):
+        """Compile the catalog into the shared directory; return its version."""
+        stamp = source_stamp(self.catalog_path)
+        catalog = load_catalog(self.catalog_path, self.shm_dir)
+        # Only a successful load marks this source as seen; a failed one is retried next pass.
+        self._stamp = stamp
+        if catalog.version != self.version:
+            self.snapshot_paths = [catalog.snapshot_path] + self.snapshot_paths[:1]
+            prune_snapshots(self.shm_dir, set(self.snapshot_paths))
+            log.info("published %s (%d tools)", catalog.snapshot_path, len(catalog))
+        return catalog.version
+
+    def worker_env(self, slot):
+        state = os.path.join(self.state_dir, f"worker-{slot}")
+        env = dict(os.environ)
+        env["AITREND_CATALOG"] = self.catalog_path
+        env["AITREND_SNAPSHOT_DIR"] = self.shm_dir
+        env["AITREND_VECTOR_DIR"] = os.path.join(state, "vectors")
+        env["AITREND_PAPERS_DB"] = os.path.join(state, "papers.sqlite")
+        env["AITREND_HISTORY_DB"] = os.path.join(state, "history.sqlite")
+        env["AITREND_WARM_START"] = os.path.join(state, "warmstart.pickle")
+        return env
+
+    def spawn(self, slot):
+        return Worker(slot, free_port(), self.worker_env(slot))
+
+    def start_workers(self):
+        workers = [self.spawn(slot) for slot in range(self.worker_count)]
+        ready = [worker for worker in workers if worker.wait_ready(self.ready_timeout)]
+        for worker in set(workers) - set(ready):
+            log.error("%r failed to start", worker)
+            worker.stop()
+        self.balancer.workers = ready
+        log.info("%d/%d workers ready", len(ready), len(workers))
+
+    def replace(self, old):
+        """Swap ``old`` for a fresh worker once the new one is healthy."""
+        new = self.spawn(old.slot)
+        if not new.wait_ready(self.ready_timeout):
+            log.error("replacement for %r failed to start", old)
+            new.stop()
+            return False
+        self.balancer.workers = [new if worker is old else worker for worker in self.balancer.workers]
+        deadline = time.monotonic() + self.drain_seconds
+        while old.connections and time.monotonic() < deadline:
+            time.sleep(0.1)
+        old.stop()
+        log.info("replaced %r with %r", old, new)
+        return True
+
+    def check(self):
+        """One supervision pass: reload on a new catalog version, restart dead workers."""
+        with self._lock:
+            if source_stamp(self.catalog_path) != self._stamp:
+                version = self.publish()
+                if version != self.version:
+                    log.info("catalog version %s -> %s, reloading workers", self.version, version)
+                    self.version = version
+                    for worker in list(self.balancer.workers):
+                        self.replace(worker)
+            for worker in list(self.balancer.workers):
+                if not worker.alive:
+                    log.warning("%r exited with %s", worker, worker.process.returncode)
+                    self.replace(worker)
+
+    def _watch(self):
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception:
+                log.exception("supervision pass failed")
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            for worker in self.balancer.workers:
+                worker.stop()
+
+    def run(self, host="0.0.0.0", port=8501):
+        self.version = self.publish()
+        self.start_workers()
+        threading.Thread(target=self._watch, name="aitrend-supervisor", daemon=True).start()
+
+        async def main():
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+            await self.balancer.serve(host, port, stop)
+
+        try:
+            asyncio.run(main())
+        finally:
+            self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8501)
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_PATH)
+    parser.add_argument("--shm-dir", default=DEFAULT_SHM_DIR)
+    parser.add_argument("--state-dir", default=DEFAULT_STATE_DIR, help="per-worker state directories go here")
+    parser.add_argument("--balance", choices=["source", "leastconn"], default="source",
+                        help="pin each client address to a worker, or pick the least busy one")
+    parser.add_argument("--poll", type=float, default=5.0, help="seconds between catalog/worker checks")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    Supervisor(args.catalog, args.workers, args.shm_dir, args.balance, args.poll,
+               state_dir=args.state_dir).run(args.host, args.port)
@@ -0,0 +1,68 @@
+"""Small bounded pool of SQLite connections shared by the app's threads.
+
+Streamlit runs every rerun on a fresh thread, so thread-local connections
+would open (and never close) one connection per rerun. A store instead
+borrows a connection from its pool for the duration of one operation; at
+most ``size`` connections are ever open, and WAL mode plus any other setup
+runs once per connection rather than once per rerun.
+"""
+import contextlib
+import queue
+import sqlite3
+import threading
+
+
+class ConnectionPool:
+    def __init__(self, path, size=4, isolation_level="", row_factory=None):
+        self.path = path
+        self.size = size
+        self.isolation_level = isolation_level
+        self.row_factory = row_factory
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                     isolation_level=self.isolation_level)
+        if self.row_factory is not None:
+            connection.row_factory = self.row_factory
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a connection, opening one if fewer than ``size`` exist, else waiting for one."""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._opened < self.size
+                if grow:
+                    self._opened += 1
+            if grow:
+                try:
+                    connection = self._open()
+                except BaseException:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                connection = self._idle.get()
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()  # Never hand out a connection mid-transaction
+            self._idle.put(connection)
+
+    def close(self):
+        """Close the idle connections."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            connection.close()
+            with self._lock:
+                self._opened -= 1
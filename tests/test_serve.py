@@ -0,0 +1,124 @@
+"""serve.py: the balancer in front of two real Streamlit workers, and catalog reloads."""
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+import urllib.request
+
+import pytest
+
+import serve
+from catalog import CatalogError, load_catalog
+
+TOOLS = [
+    {"name": "Alpha", "description": "Code generation", "link": "https://alpha.example.com", "category": ["LLM"],
+     "rating": 4.5, "users": 100, "pricing": "Free", "added": "2024-01-01", "updated": "2024-02-01"},
+    {"name": "Beta", "description": "Design tool", "link": "https://beta.example.com", "category": ["Design"],
+     "rating": 4.0, "users": 50, "pricing": "Free", "added": "2024-01-02", "updated": "2024-02-02"},
+]
+
+
+def write_catalog(path, tools):
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(tools, fh)
+
+
+@pytest.fixture
+def offline_env(tmp_path, monkeypatch):
+    # Workers inherit this: no paper feeds, trending APIs and logos on a closed local port.
+    monkeypatch.setenv("AITREND_PAPER_FEEDS", " ")
+    monkeypatch.setenv("AITREND_HF_API", "http://127.0.0.1:9")
+    monkeypatch.setenv("AITREND_GITHUB_API", "http://127.0.0.1:9")
+    monkeypatch.setenv("AITREND_LOGO_CACHE", str(tmp_path / "logos"))
+    return tmp_path
+
+
+def make_supervisor(tmp_path, catalog_path, workers=2):
+    return serve.Supervisor(str(catalog_path), workers=workers, shm_dir=str(tmp_path / "shm"), balance="leastconn",
+                            ready_timeout=90, drain_seconds=0.5, state_dir=str(tmp_path / "state"))
+
+
+@pytest.fixture
+def cluster(offline_env):
+    catalog_path = offline_env / "catalog.json"
+    write_catalog(catalog_path, TOOLS)
+    supervisor = make_supervisor(offline_env, catalog_path)
+    supervisor.version = supervisor.publish()
+    supervisor.start_workers()
+    port = serve.free_port()
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    thread = threading.Thread(target=loop.run_until_complete,
+                              args=(supervisor.balancer.serve("127.0.0.1", port, stop),), daemon=True)
+    thread.start()
+    wait_listening(port)
+    yield supervisor, port, catalog_path
+    loop.call_soon_threadsafe(stop.set)
+    thread.join(10)
+    supervisor.stop()
+
+
+def wait_listening(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(port)
+
+
+def health(port):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=5) as response:
+        return response.status, response.read()
+
+
+def test_routes_requests_and_reloads_catalog(cluster):
+    supervisor, port, catalog_path = cluster
+    workers = supervisor.balancer.workers
+    assert len(workers) == 2 and all(worker.alive for worker in workers)
+    assert health(port) == (200, b"ok")
+
+    # Two held connections land on different workers (least connections first).
+    held = [socket.create_connection(("127.0.0.1", port)) for _ in range(2)]
+    try:
+        deadline = time.monotonic() + 5
+        while sorted(w.connections for w in workers) != [1, 1] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert sorted(w.connections for w in workers) == [1, 1]
+    finally:
+        for sock in held:
+            sock.close()
+
+    # A changed catalog is published and every worker is replaced by one serving it.
+    old_version, old_pids = supervisor.version, {w.process.pid for w in workers}
+    write_catalog(catalog_path, TOOLS + [dict(TOOLS[0], name="Gamma", link="https://gamma.example.com")])
+    supervisor.check()
+    new_workers = supervisor.balancer.workers
+    assert supervisor.version == load_catalog(str(catalog_path), supervisor.shm_dir).version != old_version
+    assert len(new_workers) == 2 and not old_pids & {w.process.pid for w in new_workers}
+    assert sorted(w.slot for w in new_workers) == [0, 1]
+    assert os.path.exists(supervisor.snapshot_paths[0])
+    assert health(port) == (200, b"ok")
+
+
+def test_failed_publish_is_retried(tmp_path):
+    catalog_path = tmp_path / "catalog.json"
+    catalog_path.write_text("{not json", encoding="utf-8")
+    supervisor = make_supervisor(tmp_path, catalog_path, workers=0)
+    with pytest.raises((CatalogError, ValueError)):
+        supervisor.check()
+    write_catalog(catalog_path, TOOLS)
+    supervisor.check()  # The source was not marked as seen, so it is loaded now
+    assert supervisor.version == load_catalog(str(catalog_path), supervisor.shm_dir).version
+
+
+def test_workers_get_separate_state_dirs(tmp_path):
+    supervisor = make_supervisor(tmp_path, tmp_path / "catalog.json")
+    first, second = supervisor.worker_env(0), supervisor.worker_env(1)
+    for name in ("AITREND_VECTOR_DIR", "AITREND_PAPERS_DB", "AITREND_HISTORY_DB", "AITREND_WARM_START"):
+        assert first[name] != second[name]
+    assert first["AITREND_SNAPSHOT_DIR"] == second["AITREND_SNAPSHOT_DIR"]
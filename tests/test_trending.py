@@ -0,0 +1,101 @@
+"""TrendingStore against a local mock of the Hugging Face API."""
+import http.server
+import json
+import threading
+import time
+
+import pytest
+
+from trending import TrendingStore, default_feeds
+
+MODELS = [{"id": "org/model", "downloads": 10, "likes": 2}]
+
+
+class MockApi(http.server.ThreadingHTTPServer):
+    """Answers every request with the next scripted ``(status, headers, body)``; records request headers."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        self.responses = []
+        self.requests = []
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class MockHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        status, headers, body = self.server.responses.pop(0)
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = MockApi()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_store(api, **kwargs):
+    return TrendingStore(feeds=default_feeds(hf_api=api.base_url)[:1], **kwargs)
+
+
+def test_not_modified_reuses_etag_and_data(api):
+    api.responses = [(200, {"ETag": '"v1"'}, MODELS), (304, {"ETag": '"v1"'}, None)]
+    store = make_store(api)
+    store.refresh(wait=True, force=True)
+    first = store.get("hf_models")
+    assert first.live and first.etag == '"v1"' and first.data[0]["modelId"] == "org/model"
+
+    store.refresh(wait=True, force=True)
+    second = store.get("hf_models")
+    assert api.requests[1]["If-None-Match"] == '"v1"'
+    assert second.data == first.data and second.etag == '"v1"' and second.error is None
+    assert second is not first  # A new state is published, the old one is left untouched
+
+
+def test_rate_limit_backs_off_until_retry_after(api):
+    api.responses = [(429, {"Retry-After": "120"}, {"message": "slow down"})]
+    store = make_store(api, seed={"hf_models": [{"modelId": "seeded"}]})
+    store.refresh(wait=True, force=True)
+    state = store.get("hf_models")
+    assert state.error == "rate limited for 120s"
+    assert state.blocked_until > time.monotonic() + 100
+    assert state.data == [{"modelId": "seeded"}]  # Last good data is still served
+
+    # force ignores the TTL but never a rate-limit block: no second request goes out.
+    assert store.refresh(wait=True, force=True) == []
+    assert len(api.requests) == 1
+
+
+def test_ttl_expiry_triggers_background_refresh(api):
+    api.responses = [(200, {}, MODELS), (200, {}, MODELS + [{"id": "org/new"}])]
+    store = make_store(api, ttl=0.3)
+    store.refresh(wait=True, force=True)
+    store.get("hf_models")
+    assert len(api.requests) == 1  # Still fresh: served from cache
+
+    time.sleep(0.4)
+    stale = store.get("hf_models")
+    assert len(stale.data) == 1  # Reads never wait for the network
+    for future in store.refresh():
+        future.result()
+    deadline = time.monotonic() + 5
+    while len(store.get("hf_models").data) != 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [model["modelId"] for model in store.get("hf_models").data] == ["org/model", "org/new"]
+    assert len(api.requests) == 2
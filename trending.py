@@ -0,0 +1,190 @@
+"""Live Hugging Face / GitHub trending feeds.
+
+``TrendingStore`` is a process-wide TTL cache over a set of feeds. Reads
+never block on the network: they return the last good data immediately
+(seeded with the catalog's bundled samples) and, when that data is stale,
+schedule a background refresh on a small thread pool. Refreshes use
+conditional requests (``If-None-Match`` with the stored ETag) and back off
+until the reset time announced by ``X-RateLimit-*`` / ``Retry-After``
+headers.
+
+API base URLs come from ``AITREND_HF_API`` and ``AITREND_GITHUB_API`` so the
+store can be pointed at a local mock server.
+"""
+import copy
+import datetime
+import email.utils
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from net import LazySession
+
+HF_API = os.environ.get("AITREND_HF_API", "https://huggingface.co/api")
+GITHUB_API = os.environ.get("AITREND_GITHUB_API", "https://api.github.com")
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+
+
+class Feed:
+    """One remote listing: how to request it and how to parse the response."""
+
+    def __init__(self, name, url, parse, params=None, headers=None):
+        self.name = name
+        self.url = url
+        self.parse = parse
+        self.params = params or {}
+        self.headers = headers or {}
+
+
+class FeedState:
+    def __init__(self, data=None):
+        self.data = data or []
+        self.live = False
+        self.etag = None
+        self.fetched_at = None  # datetime of the last successful (200/304) response
+        self.expires_at = 0.0  # monotonic
+        self.blocked_until = 0.0  # monotonic, set by rate limiting
+        self.error = None
+
+
+# --- Feed definitions ---
+def parse_hf_models(payload):
+    return [
+        {
+            "modelId": item.get("modelId") or item["id"],
+            "url": f"https://huggingface.co/{item.get('modelId') or item['id']}",
+            "downloads": item.get("downloads", 0),
+            "stars": item.get("likes", 0),
+        }
+        for item in payload
+    ]
+
+
+def parse_github_repos(payload):
+    return [
+        {
+            "name": item["full_name"],
+            "description": item.get("description") or "",
+            "stars": item.get("stargazers_count", 0),
+        }
+        for item in payload.get("items", [])
+    ]
+
+
+def default_feeds(limit=10, hf_api=HF_API, github_api=GITHUB_API, github_token=GITHUB_TOKEN):
+    since = (datetime.date.today() - datetime.timedelta(days=30)).isoformat()
+    github_headers = {"Accept": "application/vnd.github+json"}
+    if github_token:
+        github_headers["Authorization"] = f"Bearer {github_token}"
+    return [
+        Feed("hf_models", f"{hf_api}/models", parse_hf_models,
+             params={"sort": "trendingScore", "limit": limit}),
+        Feed("github_trending", f"{github_api}/search/repositories", parse_github_repos,
+             params={"q": f"topic:llm created:>{since}", "sort": "stars", "order": "desc", "per_page": limit},
+             headers=github_headers),
+    ]
+
+
+# --- Rate limit handling ---
+def retry_after_seconds(headers, now=None):
+    """Seconds to wait according to rate-limit headers, or 0 if not limited."""
+    value = headers.get("Retry-After")
+    if value:
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value).timestamp()
+            return max(0.0, retry_at - (now or time.time()))
+        except (TypeError, ValueError):
+            return 60.0
+    if headers.get("X-RateLimit-Remaining") == "0":
+        reset = headers.get("X-RateLimit-Reset")
+        if reset and reset.isdigit():
+            return max(0.0, float(reset) - (now or time.time()))
+        return 60.0
+    return 0.0
+
+
+class TrendingStore:
+    def __init__(self, feeds=None, seed=None, ttl=15 * 60, error_ttl=60, timeout=(3.05, 10), session=None):
+        self.feeds = {feed.name: feed for feed in (feeds or default_feeds())}
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self._states = {name: FeedState((seed or {}).get(name)) for name in self.feeds}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._session = session or LazySession(len(self.feeds))
+        self._executor = ThreadPoolExecutor(max_workers=len(self.feeds) or 1, thread_name_prefix="trending")
+
+    def get(self, name):
+        """Return the cached ``FeedState`` for ``name``, refreshing it in the background if stale."""
+        with self._lock:
+            state = self._states[name]
+        if time.monotonic() >= state.expires_at:
+            self.refresh([name])
+        return state
+
+    def snapshot(self):
+        """Point-in-time copies of every feed's state, safe to hand to readers."""
+        with self._lock:
+            states = dict(self._states)
+        return {name: copy.copy(state) for name, state in states.items()}
+
+    def refresh(self, names=None, wait=False, force=False):
+        """Refresh ``names`` (default: all feeds) concurrently; optionally wait for completion.
+
+        ``force`` ignores the TTL but never a rate-limit block.
+        """
+        futures = []
+        now = time.monotonic()
+        with self._lock:
+            for name in names or list(self.feeds):
+                state = self._states[name]
+                if name in self._inflight:
+                    futures.append(self._inflight[name])
+                elif now >= state.blocked_until and (force or now >= state.expires_at):
+                    future = self._executor.submit(self._fetch, name)
+                    self._inflight[name] = future
+                    futures.append(future)
+        if wait:
+            for future in futures:
+                future.result()
+        return futures
+
+    def _fetch(self, name):
+        """Fetch ``name`` and publish a new ``FeedState``; published states are never mutated."""
+        feed = self.feeds[name]
+        state = copy.copy(self._states[name])
+        headers = dict(feed.headers)
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        try:
+            response = self._session.get(feed.url, params=feed.params, headers=headers, timeout=self.timeout)
+            now = time.monotonic()
+            wait_seconds = retry_after_seconds(response.headers)
+            if response.status_code in (403, 429) and wait_seconds:
+                state.blocked_until = now + wait_seconds
+                state.expires_at = state.blocked_until
+                state.error = f"rate limited for {wait_seconds:.0f}s"
+            else:
+                if response.status_code != 304:
+                    response.raise_for_status()
+                    state.data = feed.parse(response.json())
+                    state.etag = response.headers.get("ETag")
+                state.live = True
+                state.error = None
+                state.fetched_at = datetime.datetime.now()
+                state.expires_at = now + self.ttl
+                # Requests still succeed with Remaining == 0, but the next one would not.
+                state.blocked_until = now + wait_seconds
+        except Exception as exc:
+            state.error = str(exc)
+            state.expires_at = time.monotonic() + self.error_ttl
+        finally:
+            # One swap under the lock: readers see either the old state or the new one, never a mix.
+            with self._lock:
+                self._states[name] = state
+                self._inflight.pop(name, None)
+        return state
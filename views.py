@@ -0,0 +1,68 @@
+"""HTML/markdown builders for the tool list views.
+
+Each page of results is rendered as a single Streamlit element: the card
+grid is one HTML block and the compact list is one markdown block, instead of
+a handful of nested elements per tool. The card grid's logos all come from
+one sprite sheet (see ``logos.LogoCache.get_sprite``).
+"""
+import math
+from html import escape
+
+PAGE_SIZES = [12, 24, 48, 96]
+PLACEHOLDER_LOGO = "🔧"
+LOGO_SIZE = 40  # Displayed px; sprite cells are scaled down to this
+
+
+def page_bounds(total, page, page_size):
+    """Clamp ``page`` and return ``(page, start, stop, page_count)``."""
+    page_count = max(1, math.ceil(total / page_size))
+    page = min(max(page, 0), page_count - 1)
+    start = page * page_size
+    return page, start, min(start + page_size, total), page_count
+
+
+def sprite_css(sprite):
+    """Stylesheet pointing ``logo-sprite-<key>`` at the sheet, scaled to ``LOGO_SIZE`` cells."""
+    return (
+        f"<style>.logo-sprite-{sprite.key}{{background-image:url({sprite.data_uri});"
+        f"background-size:{sprite.columns * LOGO_SIZE}px {sprite.rows * LOGO_SIZE}px}}</style>"
+    )
+
+
+def card_html(tool, sprite=None):
+    cell = sprite.cells.get(tool.logo) if sprite is not None else None
+    if cell is not None:
+        x, y = (cell % sprite.columns) * LOGO_SIZE, (cell // sprite.columns) * LOGO_SIZE
+        logo = f"<span class='tool-logo logo-sprite-{sprite.key}' style='background-position:-{x}px -{y}px'></span>"
+    else:
+        logo = f"<span class='tool-logo'>{PLACEHOLDER_LOGO}</span>"
+    badges = "".join(f"<span class='category-badge'>{escape(cat)}</span>" for cat in tool.category)
+    return (
+        "<div class='tool-card'>"
+        f"<div class='tool-card-header'>{logo}<div>"
+        f"<a href='{escape(tool.link, quote=True)}' class='tool-link' target='_blank'>{escape(tool.name)}</a><br>"
+        f"<span>{'⭐' * int(tool.rating)}</span> <span>{tool.rating:.1f}</span>"
+        "</div></div>"
+        f"<p class='tool-description'>{escape(tool.description)}</p>"
+        f"<div>{badges}</div>"
+        "<div class='tool-metrics'>"
+        f"<span>👥 <b>{tool.users:,}</b> users</span><span>💰 {escape(tool.pricing)}</span>"
+        "</div>"
+        f"<div>🗓️ Updated: {tool.updated or '—'}</div>"
+        "</div>"
+    )
+
+
+def card_grid_html(tools, sprite=None):
+    cards = "".join(card_html(tool, sprite) for tool in tools)
+    style = sprite_css(sprite) if sprite is not None else ""
+    return f"{style}<div class='tool-grid'>{cards}</div>"
+
+
+def compact_markdown(tools):
+    entries = [
+        f"**[{tool.name}]({tool.link})** - {tool.rating:.1f}⭐ - {tool.pricing}  \n"
+        f"{tool.description[:100]}... - *{', '.join(tool.category)}*"
+        for tool in tools
+    ]
+    return "\n\n---\n\n".join(entries)
@@ -0,0 +1,87 @@
+"""Warm-start cache: prepared state pickled at exit and reloaded at boot.
+
+Building the tool records and the search index dominates the first rerun of
+a fresh process, and the Plotly figures are rebuilt from scratch as well.
+``WarmStart`` reads one pickle (``AITREND_WARM_START``, default
+``~/.cache/aitrend/warmstart.pickle``) when the process starts, hands out its
+entries by name and version, and at interpreter exit asks every registered
+provider for its current ``(version, value)`` and writes them back.
+
+An entry is only used when its version matches what the caller is about to
+build (e.g. the catalog version), so a stale file is ignored rather than
+trusted. Bump ``WARM_START_FORMAT`` whenever a pickled class changes layout.
+"""
+import atexit
+import gc
+import os
+import pickle
+import threading
+
+DEFAULT_WARM_START_PATH = os.environ.get(
+    "AITREND_WARM_START",
+    os.path.join(os.path.expanduser("~"), ".cache", "aitrend", "warmstart.pickle"),
+)
+WARM_START_FORMAT = "3"
+
+
+class WarmStart:
+    def __init__(self, path=DEFAULT_WARM_START_PATH):
+        self.path = path
+        self.entries = self._read()  # name -> (version, value)
+        self._providers = {}  # name -> callable returning (version, value) or None
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+
+    def _read(self):
+        if not self.path:
+            return {}
+        # Unpickling allocates one object per record; collecting mid-load only slows it down.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(self.path, "rb") as fh:
+                data = pickle.load(fh)
+            return data["entries"] if data.get("format") == WARM_START_FORMAT else {}
+        except Exception:
+            return {}  # Missing, truncated or written by an incompatible version
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def take(self, name, version):
+        """The stored value for ``name`` if it was saved at ``version``, else ``None``; either way it is dropped."""
+        with self._lock:
+            entry = self.entries.pop(name, None)
+        return entry[1] if entry is not None and entry[0] == version else None
+
+    def provide(self, name, collect):
+        """Register ``collect()`` to supply ``(version, value)`` for ``name`` when saving."""
+        with self._lock:
+            self._providers[name] = collect
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            providers = dict(self._providers)
+        entries = {}
+        for name, collect in providers.items():
+            try:
+                entry = collect()
+            except Exception:
+                entry = None
+            if entry is not None:
+                entries[name] = entry
+        if not entries:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                pickle.dump({"format": WARM_START_FORMAT, "entries": entries}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass